@@ -0,0 +1,254 @@
+#!/usr/bin/env python3.9
+
+"""
+benchmarks for the hot paths, stepping, drawing, loading, saving and storing history
+
+runs headless on fixed seeds and the shipped patterns, then compares against a stored baseline
+    python bench.py --sizes=80x40,1024x1024 --out=results.json
+    python bench.py --save-baseline
+"""
+
+__author__ = "TFC343"
+
+import argparse
+import contextlib
+import fnmatch
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # the rendering benchmarks don't need a real window
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # keeps stdout to just the json
+
+import numpy as np
+import pygame
+
+import golly
+from life import ENGINES, PATTERN_EXTENSIONS, read_pattern
+
+SIZES = ((80, 40), (256, 256), (1024, 1024), (4096, 4096))
+SEEDS = (0, 1)
+SOUP_DENSITY = 0.3
+MIN_TIME = 0.2  # each benchmark repeats for at least this long, in seconds
+MAX_REPEATS = 200
+TOLERANCE = 0.1  # how much slower than the baseline counts as a regression
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+
+def soup(width, height, seed):
+    """a random board that is always the same for the same seed"""
+    return (np.random.default_rng(seed).random((width, height)) < SOUP_DENSITY).astype(np.uint8)
+
+
+def tiled(cells, width, height):
+    """repeats a pattern until it fills a board of the given size"""
+    reps = (-(-width // cells.shape[0]), -(-height // cells.shape[1]))
+    return np.ascontiguousarray(np.tile(cells, reps)[:width, :height])
+
+
+def sources(sizes, pattern_glob):
+    """every starting board the benchmarks run on, as (name, cells)"""
+    for width, height in sizes:
+        for seed in SEEDS:
+            yield f'soup{seed}', soup(width, height, seed)
+    files = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patterns', '*.brd')))
+    for file_name in files:
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        if not fnmatch.fnmatch(name, pattern_glob):
+            continue
+        cells = read_pattern(file_name, ENGINES['array']).to_array()
+        for width, height in sizes:
+            yield name, tiled(cells, width, height)
+
+
+def make_game(cells):
+    board = golly.BoardType.from_array(cells)
+    return golly.Gol(board.width, board.height, board)
+
+
+def bench_update(cells, _):
+    game = make_game(cells)
+    while True:
+        yield game.update
+
+
+def bench_draw(cells, screen):
+    """a whole frame, stepping is left out but drawing the part of the new board in view onto the screen isn't"""
+    game = make_game(cells)
+    rect = golly.board_rect(game)
+    camera = golly.Camera()
+    camera.fit(game, rect)
+
+    def frame():
+        screen.blit(golly.draw_view(game, camera, rect.size), rect)
+    while True:
+        game.update()
+        yield frame
+
+
+def bench_load(cells, _, extension):
+    game = make_game(cells)
+    with tempfile.TemporaryDirectory() as folder:
+        file_name = os.path.join(folder, 'board' + extension)
+        golly.save(game, file_name)
+        while True:
+            yield lambda: golly.load(game, file_name)
+
+
+def bench_save(cells, _, extension):
+    game = make_game(cells)
+    with tempfile.TemporaryDirectory() as folder:
+        file_name = os.path.join(folder, 'board' + extension)
+        while True:
+            yield lambda: golly.save(game, file_name)
+
+
+def bench_store(cells, _):
+    game = make_game(cells)
+    memory = golly.Memory()
+    while True:
+        game.update()
+        yield lambda: memory.store(game)
+
+
+BENCHMARKS = {
+    'update': bench_update,
+    'draw': bench_draw,
+    'store': bench_store,
+    **{f'load{extension}': lambda cells, screen, extension=extension: bench_load(cells, screen, extension)
+       for extension in PATTERN_EXTENSIONS},
+    **{f'save{extension}': lambda cells, screen, extension=extension: bench_save(cells, screen, extension)
+       for extension in PATTERN_EXTENSIONS},
+}
+
+
+def measure(benchmark, cells, screen, min_time=MIN_TIME):
+    """times one benchmark on one board, setup from the generator isn't counted
+
+    the peak memory comes from one more call made under tracemalloc, so tracing doesn't slow the timed calls
+    """
+    times = []
+    setup = BENCHMARKS[benchmark](cells, screen)
+    try:
+        while sum(times) < min_time and len(times) < MAX_REPEATS:
+            call = next(setup)
+            start = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - start)
+        call = next(setup)
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        setup.close()
+    return times, peak
+
+
+def run(sizes, benchmarks, pattern_glob='*', min_time=MIN_TIME, log=sys.stderr):
+    screen = pygame.display.set_mode((golly.SCREEN_WIDTH, golly.SCREEN_HEIGHT))
+    results = []
+    for source, cells in sources(sizes, pattern_glob):
+        width, height = cells.shape
+        for benchmark in benchmarks:
+            times, peak = measure(benchmark, cells, screen, min_time)
+            seconds = statistics.median(times)
+            result = {'name': f'{benchmark}/{source}/{width}x{height}', 'benchmark': benchmark, 'source': source,
+                      'width': width, 'height': height, 'repeats': len(times), 'seconds': seconds,
+                      'best': min(times), 'peak_memory': peak}
+            if benchmark == 'update':
+                result['generations_per_second'] = 1 / seconds
+                result['cells_per_second'] = width * height / seconds
+            elif benchmark == 'draw':
+                result['ms_per_frame'] = seconds * 1000
+            else:
+                result['ms'] = seconds * 1000
+            results.append(result)
+            print(f"{result['name']:<50} {seconds * 1000:10.3f} ms {peak / 1024 ** 2:9.2f} MB", file=log, flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """lines up results against the baseline by name, returning the ones that got slower than the tolerance allows"""
+    old = {result['name']: result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        if result['name'] not in old:
+            continue
+        ratio = result['seconds'] / old[result['name']]['seconds']
+        result['baseline_seconds'] = old[result['name']]['seconds']
+        result['ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def machine():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'processor': platform.processor(),
+            'cpus': os.cpu_count(), 'numpy': np.__version__, 'pygame': pygame.version.ver}
+
+
+def parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]), description="benchmark the game of life")
+    parser.add_argument('--sizes', type=lambda text: [parse_size(size) for size in text.split(',')],
+                        default=list(SIZES), help="board sizes to run at, like 80x40,1024x1024")
+    parser.add_argument('--benchmarks', type=lambda text: text.split(','), default=list(BENCHMARKS),
+                        help=f"which of {','.join(BENCHMARKS)} to run")
+    parser.add_argument('--patterns', default='*', help="only the shipped patterns matching this, '' for none")
+    parser.add_argument('--engine', choices=ENGINES, default='array')
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help="seconds to repeat each benchmark for")
+    parser.add_argument('--out', help="write the results to this json file")
+    parser.add_argument('--baseline', default=BASELINE, help="compare against this results file if it exists")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    args = parser.parse_args(args)
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks {', '.join(sorted(unknown))}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        golly.init_ui()
+    golly.BoardType = ENGINES[args.engine]
+
+    results = run(args.sizes, args.benchmarks, args.patterns, args.min_time)
+    report = {'machine': machine(), 'engine': args.engine, 'results': results}
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        report['baseline'] = args.baseline
+        report['regressions'] = [result['name'] for result in regressions]
+        for result in regressions:
+            print(f"slower: {result['name']} {result['baseline_seconds'] * 1000:.3f} ms -> "
+                  f"{result['seconds'] * 1000:.3f} ms ({result['ratio']:.2f}x)", file=sys.stderr)
+        matched = sum('ratio' in result for result in results)
+        print(f"{len(regressions)} of {matched} benchmarks slower than the baseline", file=sys.stderr)
+
+    if args.out is not None:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=2)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,42 +8,82 @@ __author__ = "TFC343"
 __version__ = "1.6.0"
 
 import collections
+import contextlib
 import copy
+import cProfile
 import dataclasses
+import functools
+import glob
+import io
+import json
+import math
 import os
+import pstats
 import sys
 import logging
+import threading
 import time
-import tkinter
 import traceback
-from tkinter.filedialog import asksaveasfilename, askopenfile
-from tkinter.messagebox import showerror, askyesno
 
+STARTED = time.perf_counter()  # before the big imports, so the startup report counts them
+
+import numpy as np
 import pygame
 from pygame.locals import (
     KEYDOWN,
     K_SPACE,
     MOUSEBUTTONDOWN,
     MOUSEBUTTONUP,
+    MOUSEMOTION,
+    MOUSEWHEEL,
     QUIT,
     K_ESCAPE,
     K_p,
+    K_j,
+    K_r,
     FULLSCREEN,
     KMOD_CTRL,
     K_c,
+    K_F3,
+    K_F4,
+    K_F6,
+    K_HOME,
+    K_F10,
     K_F11,
     RESIZABLE,
+    SRCALPHA,
     VIDEORESIZE,
+    VIDEOEXPOSE,
     WINDOWMAXIMIZED,
 )
 
-pygame.init()
-pygame.font.init()
+from life import (
+    ArrayBoard,
+    CONWAY,
+    ChunkBoard,
+    CycleDetector,
+    DimensionError,
+    ENGINES,
+    PATTERN_EXTENSIONS,
+    RECORD_EVERY,
+    RECORD_FPS,
+    RULES,
+    Recorder,
+    Rule,
+    TOPOLOGIES,
+    TILE,
+    crop,
+    can_hashlife,
+    cli,
+    hashlife_jump,
+    pattern_summary,
+    read_pattern,
+    replacing,
+    set_workers,
+    write_pattern,
+)
 
-print(pygame.display.Info())
-SCREEN_WIDTH = int(pygame.display.Info().current_w*0.85)
-SCREEN_HEIGHT = int(SCREEN_WIDTH * (900/1600))
-# SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900  # worked out from the display by init_ui
 
 BLACK = pygame.color.Color((0, 0, 0))
 GREY0 = pygame.color.Color((20, 20, 20))
@@ -55,101 +95,175 @@ WHITE = pygame.color.Color((255, 255, 255))
 BLUE = pygame.color.Color((0, 0, 255))
 
 
-class DimensionError(Exception):
-    pass
+class Multiplier:
+    def __init__(self, factor):
+        self.factor = factor
 
+    def __mul__(self, other):
+        return round(self.factor * other)
 
-class AbyssList(list):
-    def __getitem__(self, item):
-        if 0 <= item < len(self):
-            return list.__getitem__(self, item)
-        else:
-            return VoidEntity()
+    def __rmul__(self, other):
+        return round(self.factor * other)
 
-    def __setitem__(self, key, value):
-        if 0 <= key < len(self):
-            list.__setitem__(self, key, value)
-        else:
-            pass
 
+class LazyFont:
+    """a system font that isn't looked for until it's first used, finding system fonts is slow"""
+    def __init__(self, name, size):
+        self.name, self.size = name, size
+        self.font = None
 
-class TorusList(list):
-    def __getitem__(self, item):
-        item = item % len(self)
-        return list.__getitem__(self, item)
+    def __getattr__(self, item):
+        if self.font is None:
+            self.font = pygame.font.SysFont(self.name, self.size)
+        return getattr(self.font, item)
 
-    def __setitem__(self, key, value):
-        key = key % len(self)
-        list.__setitem__(self, key, value)
 
+RATIO = Multiplier(SCREEN_WIDTH / 1600)
+FONT = SETTINGS_FONT = None  # made by init_ui
+TK_ROOT = None  # the one hidden tkinter window every dialog belongs to, made the first time a dialog is needed
 
-ListType = TorusList  # the type of list being used for the board
+BoardType = ArrayBoard  # the engine used to store and step the board
+RULE = CONWAY  # the rule new boards get, from --rule or whatever the board last played by
+TOPOLOGY = None  # the edges of new boards from --topology, None for the default torus
+WATCH_CYCLES = False  # if boards are watched for repeating, from the cycles and pause-on-cycle flags
+MAX_JUMP_POWER = 40
+MAX_SLOW_JUMP_POWER = 10  # the biggest jump allowed on boards hashlife can't handle
 
 
-class VoidEntity:
-    def __init__(self):
-        pass
+def init_ui():
+    """starts the parts of pygame that are used and sizes everything to the display, nothing else needs a display
 
-    def __call__(self, *args, **kwargs):
-        return VoidEntity()
+    only the display and fonts are started, sound and joysticks never are, and the fonts are found when first used
+    """
+    global SCREEN_WIDTH, SCREEN_HEIGHT, RATIO
+    pygame.display.init()
+    pygame.font.init()
 
-    def __getattribute__(self, item):
-        return VoidEntity()
+    logging.debug(pygame.display.Info())
+    SCREEN_WIDTH = int(pygame.display.Info().current_w*0.85)
+    SCREEN_HEIGHT = int(SCREEN_WIDTH * (900/1600))
+    # SCREEN_WIDTH, SCREEN_HEIGHT = 1600, 900
+    RATIO = Multiplier(SCREEN_WIDTH / 1600)
+    make_fonts()
 
-    def __setattr__(self, key, value):
-        pass
 
-    def __getitem__(self, item):
-        return VoidEntity()
+def make_fonts():
+    """the fonts at the current RATIO"""
+    global FONT, SETTINGS_FONT
+    FONT = LazyFont('arial', 30*RATIO)
+    SETTINGS_FONT = LazyFont('arial', 24*RATIO)
 
-    def __setitem__(self, key, value):
-        pass
 
-    def __eq__(self, other):
-        return False
+def tk_root():
+    """the hidden tkinter root, tkinter is only imported and started the first time a dialog is wanted"""
+    global TK_ROOT
+    if TK_ROOT is None:
+        import tkinter
+        TK_ROOT = tkinter.Tk()
+        TK_ROOT.withdraw()
+    return TK_ROOT
 
-    def __ne__(self, other):
-        return False
 
-    def __lt__(self, other):
-        return False
+def confirm_quit():
+    from tkinter.messagebox import askyesno
+    return askyesno("do you want to quit?", message="are you sure you want to quit?", parent=tk_root())
 
 
-class Multiplier:
-    def __init__(self, factor):
-        self.factor = factor
+def ask_save_name():
+    from tkinter.filedialog import asksaveasfilename
+    return asksaveasfilename(parent=tk_root(), filetypes=[("board", "*.brd"), ("run length encoded", "*.rle"), ("packed board", "*.pbrd")])
 
-    def __mul__(self, other):
-        return round(self.factor * other)
 
-    def __rmul__(self, other):
-        return round(self.factor * other)
+def ask_open_name():
+    """a file picked in the file dialog, or None"""
+    from tkinter.filedialog import askopenfilename
+    return askopenfilename(parent=tk_root()) or None
 
 
-RATIO = Multiplier(SCREEN_WIDTH / 1600)
-FONT = pygame.font.SysFont('arial', 30*RATIO)
-SETTINGS_FONT = pygame.font.SysFont('arial', 24*RATIO)
+def show_error(message):
+    from tkinter.messagebox import showerror
+    showerror("Error", message, parent=tk_root())
+
+
+class StartupTimer:
+    """times each step from starting to the first frame being on screen, which is logged once that frame is shown"""
+    def __init__(self, start=STARTED):
+        self.start = self.last = start
+        self.steps = []
+        self.reported = False
+
+    def mark(self, name):
+        """ends the step called name"""
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        self.mark('first frame')
+        self.reported = True
+        steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.steps)
+        logging.info(f"first frame after {(self.last - self.start) * 1000:.0f} ms ({steps})")
+
+
+def get_option(name, default=None):
+    """gets the value of a --name=value command line option"""
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return arg.split('=', 1)[1]
+    return default
+
+
+def cycle_detector(board):
+    """a detector following the board, or None when cycles aren't being watched as it costs a lot on busy boards"""
+    return CycleDetector(board) if WATCH_CYCLES else None
 
 
 class Gol:
     def __init__(self, x=80, y=40, board=None):
         self.screen_width, self.screen_height = 1600, 900
-        self.board_width, self.board_height = x, y
-        self.pixel_width, self.pixel_height = self.screen_width / self.board_width, self.screen_height / self.board_height
         if board is None:
-            self.board = ListType([ListType([0 for _ in range(self.board_height)]) for _ in range(self.board_width)])
+            self.board = BoardType(x, y, TOPOLOGY, rule=RULE)
         else:
             self.board = board
-        self.surf = pygame.Surface((self.screen_width,  self.screen_height))
+        self.cycles = cycle_detector(self.board)  # watches for the board repeating while it plays
+        self.set_size(x, y)
+        self.draw()
+
+    def set_size(self, x, y):
+        self.board_width, self.board_height = x, y
+        self.pixel_width, self.pixel_height = self.screen_width / self.board_width, self.screen_height / self.board_height
+        self.surf = pygame.Surface((self.board_width, self.board_height), 0, 32)  # one pixel per cell, scaled up when shown
         self.surf.fill(GREY1)
+        self.colours = np.array([self.surf.map_rgb(GREY1), self.surf.map_rgb(WHITE)], np.uint32)
+        self.drawn = None  # the serial of the board last drawn onto surf
+
+    def set_board(self, board):
+        """swaps in another board, only making a new surface if it is a different size"""
+        if (board.width, board.height) != (self.board_width, self.board_height):
+            self.set_size(board.width, board.height)
+        self.board = board
+        self.cycles = cycle_detector(board)
+        self.drawn = None
         self.draw()
 
     def draw(self):
-        self.surf.fill(GREY1)
-        for x, row in enumerate(self.board):
-            for y, point in enumerate(row):
-                if point == 1:
-                    pygame.draw.rect(self.surf, WHITE, (x * self.pixel_width, y * self.pixel_height, self.pixel_width, self.pixel_height))
+        """keeps surf up to date with an array board, other boards are drawn from only the part in view by draw_view"""
+        board = self.board
+        if not isinstance(board, ArrayBoard):
+            return
+        changed = getattr(board, 'changed', None)
+        pixels = pygame.surfarray.pixels2d(self.surf)
+        if changed is not None and self.drawn in (board.serial, board.previous):
+            # surf already shows this board or the one before it, so only the area with changed tiles needs copying
+            if changed.any():
+                tx, ty = np.nonzero(changed)
+                x0, x1 = tx.min() * TILE, (tx.max() + 1) * TILE
+                y0, y1 = ty.min() * TILE, (ty.max() + 1) * TILE
+                pixels[x0:x1, y0:y1] = self.colours[board.cells[x0:x1, y0:y1]]
+        else:
+            pixels[:] = self.colours[board.to_array()]
+        del pixels  # unlocks the surface
+        self.drawn = getattr(board, 'serial', None)
 
         # for column in range(1, self.board_width):
         #     pygame.draw.line(self.surf, GREY2, (column * self.pixel_width, 0), (column * self.pixel_width, self.screen_height), 1)
@@ -157,36 +271,22 @@ class Gol:
     # for row in range(1, self.board_height):
     #     pygame.draw.line(self.surf, GREY2, (0, row * self.pixel_height), (self.screen_width, row * self.pixel_height), 1)
 
-    def draw_data(self):
-        for x, row in enumerate(self.board):
-            for y, _ in enumerate(row):
-                surrounding = 0
-                points = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-                for d0, d1 in points:
-                    if self.board[x+d0][y+d1] == 1:
-                        surrounding += 1
-                self.surf.blit(FONT.render(str(surrounding), False, BLUE), (x*self.pixel_width+self.pixel_width//2, y*self.pixel_height+self.pixel_height//2))
-
     def update(self):
-        new_board = ListType([ListType([0 for _ in range(self.board_height)]) for _ in range(self.board_width)])
-        for x, row in enumerate(self.board):
-            for y, _ in enumerate(row):
-                surrounding = 0
-                points = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-                for d0, d1 in points:
-                    if self.board[x + d0][y + d1] == 1:
-                        surrounding += 1
-                if self.board[x][y] == 1 and (surrounding == 2 or surrounding == 3):
-                    new_board[x][y] = 1
-                elif self.board[x][y] == 0 and (surrounding == 3):
-                    new_board[x][y] = 1
-                else:
-                    new_board[x][y] = 0
-
-        self.board = new_board
+        """steps the board, returns True on the generation it is first seen to repeat"""
+        self.board = self.board.step()
+        if RECORDER is not None:
+            RECORDER.offer(self.board)
+        if self.cycles is not None and self.cycles.update(self.board):
+            logging.info(f"the board repeats, {self.cycles.describe()}")
+            return True
+        return False
+
+    def set_cell(self, x, y, value):
+        self.board[x][y] = value
+        self.cycles = cycle_detector(self.board)  # drawing breaks the run of generations
 
     def swap_cell(self, x, y):
-        self.board[x][y] = int(not self.board[x][y])
+        self.set_cell(x, y, int(not self.board[x][y]))
 
     def play_step(self, ):
         # update
@@ -195,77 +295,1115 @@ class Gol:
         # draw
         self.draw()
 
+    def jump(self, generations):
+        """moves the game on by many generations at once"""
+        self.board = hashlife_jump(self.board, generations)
+        if RECORDER is not None:
+            RECORDER.offer(self.board, generations)
+        self.cycles = cycle_detector(self.board)
+        self.draw()
+
+    def set_rule(self, rule):
+        """keeps the cells but plays them by another rule from now on
+
+        goes through a snapshot rather than to_array, which on an unbounded plane is only the part that is shown
+        """
+        cells, layout = self.board.snapshot()
+        self.set_board(type(self.board).from_snapshot(cells, layout[:-1] + (rule,)))
+
     def reset(self):
-        self.board = ListType([ListType([0 for _ in range(self.board_height)]) for _ in range(self.board_width)])
+        self.board = BoardType(self.board_width, self.board_height, TOPOLOGY, rule=self.board.rule)
+        self.cycles = cycle_detector(self.board)
+
+
+HISTORY_BUDGET = 64 * 1024 * 1024  # how many bytes of back and forward history are kept before the oldest goes
+KEYFRAME_INTERVAL = 32  # a whole board is stored at least this often, so rebuilding one never needs too many diffs
 
 
 @dataclasses.dataclass
-class sGol:
-    """a holder class for all important information of the game"""
-    board_width: int
-    board_height: int
-    board: ListType
+class HistoryEntry:
+    """one board in a history, either a whole packed board (a keyframe) or the bytes that changed since the one before"""
+    data: np.ndarray  # the packed board, or the changed bytes xor-ed with what they were
+    shape: tuple = None  # (snapshot layout, board type, cells shape), only on keyframes
+    index: np.ndarray = None  # where the changed bytes go, only on diffs
+    depth: int = 0  # how many diffs since the last keyframe
 
-    @staticmethod
-    def convert(game_inst: Gol):
-        """convert the Gol instant into the holder type"""
-        return sGol(game_inst.board_width, game_inst.board_height, game_inst.board)
+    @property
+    def nbytes(self):
+        return self.data.nbytes + (0 if self.index is None else self.index.nbytes)
 
 
-class Memory:
+class History:
+    """a stack of boards stored as keyframes and diffs, the top board is kept unpacked so pushing and popping is quick"""
     def __init__(self):
-        self.past = collections.deque()  # all the past action the user makes
-        self.future = collections.deque()  # the the future action the user makes (when the user clicks back)
+        self.entries = collections.deque()
+        self.size = 0  # bytes used by the entries
+        self.top = None  # the packed bits of the board on the top
+        self.top_shape = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, board):
+        cells, layout = board.snapshot()
+        bits = np.packbits(cells)
+        shape = (layout, type(board), cells.shape)
+        entry = None
+        if self.entries and shape == self.top_shape and self.entries[-1].depth < KEYFRAME_INTERVAL:
+            diff = bits ^ self.top
+            index = np.flatnonzero(diff).astype(np.uint32)
+            if index.nbytes + index.size < bits.nbytes:  # otherwise the diff would be bigger than the board
+                entry = HistoryEntry(diff[index], index=index, depth=self.entries[-1].depth + 1)
+        if entry is None:
+            entry = HistoryEntry(bits, shape)
+        self.entries.append(entry)
+        self.size += entry.nbytes
+        self.top, self.top_shape = bits, shape
+
+    def pop(self):
+        """takes the top board off and returns it"""
+        bits, (layout, board_type, cells_shape) = self.top, self.top_shape
+        entry = self.entries.pop()
+        self.size -= entry.nbytes
+        if not self.entries:
+            self.top, self.top_shape = None, None
+        elif entry.shape is None:
+            # undo the diff to get the board below
+            self.top = bits.copy()
+            self.top[entry.index] ^= entry.data
+        else:
+            self.top, self.top_shape = self.rebuild(len(self.entries) - 1)
+        cells = np.unpackbits(bits, count=int(np.prod(cells_shape))).reshape(cells_shape)
+        return board_type.from_snapshot(cells, layout)
+
+    def rebuild(self, i):
+        """the packed bits and shape of entry i, from the keyframe before it and the diffs since"""
+        start = i
+        while self.entries[start].shape is None:
+            start -= 1
+        bits = self.entries[start].data.copy()
+        for j in range(start + 1, i + 1):
+            entry = self.entries[j]
+            bits[entry.index] ^= entry.data
+        return bits, self.entries[start].shape
+
+    def drop_oldest(self):
+        """removes the bottom board, turning the one above into a keyframe if it needs to be"""
+        oldest = self.entries.popleft()
+        self.size -= oldest.nbytes
+        if self.entries and self.entries[0].shape is None:
+            entry = self.entries[0]
+            bits = oldest.data.copy()
+            bits[entry.index] ^= entry.data
+            self.entries[0] = HistoryEntry(bits, oldest.shape)
+            self.size += bits.nbytes - entry.nbytes
+
+
+class Memory:
+    def __init__(self, budget=HISTORY_BUDGET):
+        self.past = History()  # all the past action the user makes
+        self.future = History()  # the the future action the user makes (when the user clicks back)
+        self.budget = budget  # the most bytes past and future can use together
 
     def is_empty(self) -> tuple[bool, bool]:
         """checks if past or future are empty"""
         return not bool(len(self.past)), not bool(len(self.future))
 
+    def trim(self):
+        """drops the oldest history until it fits in the budget, always keeping the latest step back"""
+        while self.past.size + self.future.size > self.budget:
+            if len(self.past) > 1:
+                self.past.drop_oldest()
+            elif len(self.future) > 1:
+                self.future.drop_oldest()
+            else:
+                break
+
     def store(self, game_inst):
-        self.future = collections.deque()
-        g = sGol.convert(game_inst)
-        self.past.append(copy.deepcopy(g))
+        self.future = History()
+        self.past.push(game_inst.board)
+        self.trim()
 
     def get_past(self, game_inst):
         """called when user pressed back"""
-        g = sGol.convert(game_inst)
-        self.future.append(copy.deepcopy(g))
-        j: sGol = self.past.pop()
-        return Gol(j.board_width, j.board_height, j.board)
+        self.future.push(game_inst.board)
+        game_inst.set_board(self.past.pop())
+        self.trim()
+        return game_inst
 
     def get_forward(self, game_inst):
         """called when user clicks forward"""
-        g = sGol.convert(game_inst)
-        self.past.append(copy.deepcopy(g))
-        j: sGol = self.future.pop()
-        return Gol(j.board_width, j.board_height, j.board)
+        self.past.push(game_inst.board)
+        game_inst.set_board(self.future.pop())
+        self.trim()
+        return game_inst
 
 
 def load(game_inst, file_name):
     old_game = copy.copy(game_inst)
-    if file_name.split(".")[-1] == 'brd':
-        try:
-            with open(str(file_name), 'r') as file:
-                str_ = file.read()
-                str_ = str_.split(' ')
-                if not(int(str_[0]) * int(str_[1]) == len(str_[2])):
-                    raise DimensionError("dimensions do not fit data")
-                new_board = ListType(
-                    [ListType([0 for _ in range(int(str_[1]))]) for _ in range(int(str_[0]))])
-                new_game = Gol(int(str_[0]), int(str_[1]))
-                for x, rows in enumerate(new_board):
-                    for y, dat in enumerate(rows):
-                        new_game.board[x][y] = int(str_[2][x*len(rows) + y])
-                return new_game
-        except FileNotFoundError:
-            logging.warning("file not found")
-            return old_game
-        except DimensionError:
-            logging.warning("the dimensions provided do not fit the data")
-            return old_game
-    else:
+    try:
+        board = read_pattern(file_name, BoardType, TOPOLOGY)
+    except FileNotFoundError:
+        logging.warning("file not found")
+        return old_game
+    except DimensionError:
+        logging.warning("the dimensions provided do not fit the data")
+        return old_game
+    except TypeError:
         logging.warning("wrong file type")
-        return old_game    
+        return old_game
+    except ValueError:
+        logging.warning("the file is not a board")
+        return old_game
+    return Gol(board.width, board.height, board)
+
+
+def save(game_inst, file_name):
+    try:
+        write_pattern(file_name, game_inst.board)
+    except OSError:
+        logging.warning(f"could not save to {file_name}")
+
+
+def jump(game_inst, power):
+    """jumps the game on 2^power generations, refusing long jumps that would have to go one generation at a time"""
+    if not can_hashlife(game_inst.board) and power > MAX_SLOW_JUMP_POWER:
+        logging.warning(f"hashlife needs a torus with sides that are powers of two or an unbounded plane, jump at most 2^{MAX_SLOW_JUMP_POWER} on this board")
+        return 0
+    game_inst.jump(2 ** power)
+    return 2 ** power
+
+
+def toolbar_rects():
+    """where every toolbar button goes at the current screen size"""
+    return {
+        'play': pygame.Rect((40*RATIO, 20*RATIO, 100*RATIO, 50*RATIO)),
+        'step': pygame.Rect((40*RATIO, 80*RATIO, 100*RATIO, 30*RATIO)),
+        'clear': pygame.Rect((165*RATIO, 20*RATIO, 75*RATIO, 90*RATIO)),
+        'back': pygame.Rect((315*RATIO, 20*RATIO, 100*RATIO, 40*RATIO)),
+        'forward': pygame.Rect((315*RATIO, 70*RATIO, 100*RATIO, 40*RATIO)),
+        'slow': pygame.Rect((491*RATIO, 20*RATIO, 100*RATIO, 40*RATIO)),
+        'speed': pygame.Rect((491*RATIO, 70*RATIO, 100*RATIO, 40*RATIO)),
+        'size': pygame.Rect((667*RATIO, 20*RATIO, 100*RATIO, 90*RATIO)),
+        'jump': pygame.Rect((843*RATIO, 20*RATIO, 150*RATIO, 40*RATIO)),
+        'less_jump': pygame.Rect((843*RATIO, 70*RATIO, 70*RATIO, 40*RATIO)),
+        'more_jump': pygame.Rect((923*RATIO, 70*RATIO, 70*RATIO, 40*RATIO)),
+        'save_as': pygame.Rect((1225*RATIO, 20*RATIO, 75*RATIO, 90*RATIO)),
+        'load': pygame.Rect((1325*RATIO, 20*RATIO, 75*RATIO, 90*RATIO)),
+        'quit': pygame.Rect((1475*RATIO, 20*RATIO, 75*RATIO, 90*RATIO)),
+    }
+
+
+def button_at(buttons, pos):
+    """the name of the button under pos, or None"""
+    for name, rect in buttons.items():
+        if rect.collidepoint(pos):
+            return name
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def draw_toolbar(screen_width, screen_height, hovered, playing, jump_power):
+    """draws the toolbar onto its own surface, the screen size is only there so a resize draws it again"""
+    surf = pygame.Surface((screen_width, int(screen_height * 0.148) + 1))
+    surf.fill(GREY3)
+    pygame.draw.line(surf, GREY1, (0, screen_height*0.148), (screen_width, screen_height*0.148))
+    for x in (278, 453, 629, 805, 1187):
+        pygame.draw.line(surf, GREY1, (x*RATIO, 0*RATIO), (x*RATIO, 133*RATIO))
+    pygame.draw.line(surf, GREY1, (1438*RATIO, 0), (1438*RATIO, screen_height * 0.148))
+
+    # the text on each button as (text, centre, left), a centre of None is the middle of the button
+    labels = {
+        'play': [("pause" if playing else "play", (0, 45), 48)],
+        'step': [("play step", (0, 95), 48)],
+        'clear': [("clear", (200, 65), None)],
+        'back': [("back", None, 325)],
+        'forward': [("forward", None, 325)],
+        'slow': [("- speed", None, None)],
+        'speed': [("+ speed", None, None)],
+        'size': [("change", (717, 55), None), ("board size", (717, 75), None)],
+        'jump': [(f"jump 2^{jump_power}", None, None)],
+        'less_jump': [("- jump", None, None)],
+        'more_jump': [("+ jump", None, None)],
+        'save_as': [("save as", (1263, 65), None)],
+        'load': [("load", (1363, 65), None)],
+        'quit': [("quit", (1512, 65), None)],
+    }
+    for name, rect in toolbar_rects().items():
+        pygame.draw.rect(surf, GREY0, rect, 5)
+        pygame.draw.rect(surf, GREY2_5 if name == hovered else GREY2, rect)
+        for label, centre, left in labels[name]:
+            text = SETTINGS_FONT.render(label, False, BLACK)
+            r = text.get_rect()
+            r.center = rect.center if centre is None else (centre[0]*RATIO, centre[1]*RATIO)
+            if left is not None:
+                r.left = left*RATIO
+            surf.blit(text, r)
+    return surf
+
+
+def board_rect(game_inst):
+    """where the board goes on the screen, as big as will fit under the toolbar"""
+    if SCREEN_HEIGHT*Multiplier(0.8*game_inst.board_width/game_inst.board_height) < SCREEN_WIDTH:
+        size = (SCREEN_HEIGHT*Multiplier(0.8*game_inst.board_width/game_inst.board_height), SCREEN_HEIGHT*Multiplier(0.8))
+    else:
+        size = (SCREEN_WIDTH*Multiplier(0.95), SCREEN_WIDTH*Multiplier(0.95*game_inst.board_height/game_inst.board_width))
+    rect = pygame.Rect((0, 0), size)
+    rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT*Multiplier(0.57))
+    return rect
+
+
+GRID_MIN_ZOOM = 6  # cells have to be this many pixels across before the grid lines are drawn
+MIN_ZOOM = 1 / 64  # the least pixels across a cell can get on an unbounded plane
+MAX_ZOOM = 64
+ZOOM_STEP = 1.25  # how much one click of the mouse wheel zooms by
+
+
+class Camera:
+    """the part of the board on screen, as the board position at the top left of the board rect and pixels per cell"""
+    def __init__(self):
+        self.x, self.y = 0.0, 0.0
+        self.zoom = 1.0
+
+    def fit(self, game_inst, rect):
+        """shows the whole board, like it was before there was a camera"""
+        self.zoom = min(rect.width / game_inst.board_width, rect.height / game_inst.board_height)
+        self.x = self.y = 0.0
+        self.clamp(game_inst, rect)
+
+    def visible(self, game_inst, size):
+        """the cells a view of this size shows, as x0, y0, x1, y1, cut down to the board when it has edges"""
+        x0, y0 = math.floor(self.x), math.floor(self.y)
+        x1, y1 = math.ceil(self.x + size[0] / self.zoom), math.ceil(self.y + size[1] / self.zoom)
+        if not isinstance(game_inst.board, ChunkBoard):
+            x0, y0 = max(x0, 0), max(y0, 0)
+            x1, y1 = min(x1, game_inst.board_width), min(y1, game_inst.board_height)
+        return x0, y0, x1, y1
+
+    def clamp(self, game_inst, rect):
+        """keeps a bounded board on screen, centred along any side it doesn't fill"""
+        if isinstance(game_inst.board, ChunkBoard):
+            return
+        view_x, view_y = rect.width / self.zoom, rect.height / self.zoom
+        if view_x >= game_inst.board_width:
+            self.x = (game_inst.board_width - view_x) / 2
+        else:
+            self.x = min(max(self.x, 0), game_inst.board_width - view_x)
+        if view_y >= game_inst.board_height:
+            self.y = (game_inst.board_height - view_y) / 2
+        else:
+            self.y = min(max(self.y, 0), game_inst.board_height - view_y)
+
+    def cell_at(self, pos, rect):
+        """the board position under a point on the screen"""
+        return math.floor(self.x + (pos[0] - rect.left) / self.zoom), math.floor(self.y + (pos[1] - rect.top) / self.zoom)
+
+    def zoom_at(self, pos, rect, factor, game_inst):
+        """zooms in or out keeping the board position under pos still, a bounded board can't get smaller than fits"""
+        if isinstance(game_inst.board, ChunkBoard):
+            least = MIN_ZOOM
+        else:
+            least = min(rect.width / game_inst.board_width, rect.height / game_inst.board_height)
+        zoom = min(max(self.zoom * factor, least), MAX_ZOOM)
+        x, y = pos[0] - rect.left, pos[1] - rect.top
+        self.x, self.y = self.x + x / self.zoom - x / zoom, self.y + y / self.zoom - y / zoom
+        self.zoom = zoom
+        self.clamp(game_inst, rect)
+
+    def pan(self, rel, rect, game_inst):
+        """moves the board along with the mouse"""
+        self.x -= rel[0] / self.zoom
+        self.y -= rel[1] / self.zoom
+        self.clamp(game_inst, rect)
+
+
+OVERLAYS = (None, 'neighbours', 'age', 'activity')  # the debug overlays F4 goes through
+HEATMAPS = ('age', 'activity')
+DIGIT_MIN_ZOOM = 12  # cells have to be this many pixels across before their neighbour counts are written on them
+ACTIVITY_DECAY = 0.9  # how much of a cell's activity is left after a generation without it flipping
+
+
+class Heatmap:
+    """how long each cell has been alive and how much it has been flipping, for the heatmap overlays
+
+    it follows the part of the board in view once a frame rather than every generation, so it costs the same however
+    fast the board plays or however big the board is, ages are rounded up to whole frames when more than one generation
+    is stepped in one
+    when the view moves, what was followed of the part still in view is kept and the cells coming into view start afresh
+    """
+    def __init__(self):
+        self.cells = None
+        self.x, self.y = 0, 0  # the board position of the followed rectangle's top left corner
+        self.age = None  # generations each live cell has been alive for, 0 for dead cells
+        self.activity = None  # 1 for a cell that just flipped, fading by ACTIVITY_DECAY each generation after
+
+    def follow(self, board, generations, x0, y0, width, height):
+        cells = board.region(x0, y0, width, height)
+        if self.cells is None:
+            self.cells, self.age, self.activity = cells, cells.astype(np.uint32), np.zeros(cells.shape, np.float32)
+            self.x, self.y = x0, y0
+            return
+        if (x0, y0, width, height) != (self.x, self.y, *self.cells.shape):
+            dx, dy = x0 - self.x, y0 - self.y
+            kept = crop(np.ones(self.cells.shape, bool), dx, dy, width, height)
+            self.cells = np.where(kept, crop(self.cells, dx, dy, width, height), cells)
+            self.age = np.where(kept, crop(self.age, dx, dy, width, height), cells).astype(np.uint32)
+            self.activity = crop(self.activity, dx, dy, width, height)
+            self.x, self.y = x0, y0
+        flipped = cells != self.cells
+        if not generations and not flipped.any():
+            return
+        generations = max(generations, 1)  # drawing on the board counts as a generation
+        self.age = np.where(cells == 1, np.where(self.cells == 1, self.age + generations, 1), 0).astype(np.uint32)
+        self.activity *= ACTIVITY_DECAY ** generations
+        self.activity[flipped] = 1
+        self.cells = cells
+
+    def pixels(self, mode, x0, y0, width, height):
+        """the heatmap of a rectangle as 32 bit pixels, dead cells outside what's followed"""
+        x0, y0 = x0 - self.x, y0 - self.y
+        if mode == 'age':
+            return heat_palette(mode)[np.minimum(crop(self.age, x0, y0, width, height), 255)]
+        levels = (crop(self.activity, x0, y0, width, height) * 254).astype(np.uint8)  # 255 is kept for still live cells
+        pixels = heat_palette(mode)[levels]
+        pixels[(crop(self.cells, x0, y0, width, height) == 1) & (levels == 0)] = heat_palette(mode)[-1]  # still live cells
+        return pixels
+
+
+@functools.lru_cache(maxsize=None)
+def heat_palette(mode):
+    """256 mapped 32 bit colours for a heatmap, 0 is a dead cell
+
+    ages go from white when born to red when old, activity fades from cyan to dark, with the last colour for live cells
+    that haven't changed
+    """
+    surf = pygame.Surface((1, 1), 0, 32)
+    if mode == 'age':
+        stops = [WHITE, pygame.Color(255, 220, 0), pygame.Color(255, 120, 0), pygame.Color(200, 0, 0)]
+        levels = [GREY1] + [colour_at(stops, i / 254) for i in range(255)]
+    else:
+        stops = [GREY1, pygame.Color(0, 90, 255), pygame.Color(0, 255, 255)]
+        levels = [colour_at(stops, i / 254) for i in range(255)] + [WHITE]
+    return np.array([surf.map_rgb(colour) for colour in levels], np.uint32)
+
+
+def colour_at(stops, amount):
+    """a colour part way along evenly spaced colour stops, amount from 0 to 1"""
+    position = amount * (len(stops) - 1)
+    i = min(int(position), len(stops) - 2)
+    return stops[i].lerp(stops[i + 1], position - i)
+
+
+@functools.lru_cache(maxsize=8)
+def digit_atlas(size):
+    """the digits 0 to 8 rendered once onto one surface for a text size, and the area of each digit"""
+    font = pygame.font.SysFont('arial', size)
+    glyphs = [font.render(str(n), True, BLUE) for n in range(9)]
+    width, height = max(glyph.get_width() for glyph in glyphs), max(glyph.get_height() for glyph in glyphs)
+    atlas = pygame.Surface((width * len(glyphs), height), SRCALPHA)
+    for n, glyph in enumerate(glyphs):
+        atlas.blit(glyph, (n * width + (width - glyph.get_width()) // 2, 0))
+    return atlas, [pygame.Rect(n * width, 0, width, height) for n in range(len(glyphs))]
+
+
+def draw_neighbours(surf, game_inst, camera, x0, y0, x1, y1):
+    """writes how many live neighbours each cell in view has on it, cells with none are left blank
+
+    the counts come from the board in one go and the digits are copied out of the atlas in one blits call
+    """
+    counts = game_inst.board.neighbour_counts(x0, y0, x1 - x0, y1 - y0)
+    atlas, areas = digit_atlas(max(1, int(camera.zoom * 0.6)))
+    xs, ys = np.nonzero(counts)
+    lefts = np.round((xs + x0 - camera.x + 0.5) * camera.zoom).astype(int) - areas[0].width // 2
+    tops = np.round((ys + y0 - camera.y + 0.5) * camera.zoom).astype(int) - areas[0].height // 2
+    surf.blits([(atlas, (left, top), areas[count]) for left, top, count in zip(lefts.tolist(), tops.tolist(), counts[xs, ys].tolist())],
+               doreturn=False)
+
+
+@functools.lru_cache(maxsize=None)
+def density_palette():
+    """the colour for each density from 0 to 255, as mapped 32 bit pixels, anything alive is at least a bit lit"""
+    surf = pygame.Surface((1, 1), 0, 32)
+    return np.array([surf.map_rgb(GREY1)] + [surf.map_rgb(GREY1.lerp(WHITE, 0.25 + 0.75 * i / 255)) for i in range(1, 256)], np.uint32)
+
+
+def cells_surface(pixels):
+    surf = pygame.Surface(pixels.shape, 0, 32)
+    pygame.surfarray.blit_array(surf, pixels)
+    return surf
+
+
+def draw_view(game_inst, camera, size, overlay=None, heatmap=None, frame_timer=None):
+    """draws the part of the board the camera can see, only that part is ever scaled
+
+    cells smaller than a pixel are drawn as tiles of how many of their cells are alive, worked out in bulk
+    the overlays are only drawn once cells are at least a pixel across
+    with a frame_timer, getting the cells, scaling them and the grid are timed as the draw, scale and grid phases
+    """
+    phase = contextlib.nullcontext if frame_timer is None else frame_timer.phase
+    width, height = size
+    zoom = camera.zoom
+    board = game_inst.board
+    unbounded = isinstance(board, ChunkBoard)
+    surf = pygame.Surface(size)
+    surf.fill(GREY3)
+
+    x0, y0, x1, y1 = camera.visible(game_inst, size)
+    if x0 >= x1 or y0 >= y1:
+        return surf
+
+    if zoom >= 1:
+        with phase('draw'):
+            if overlay in HEATMAPS:
+                cells = cells_surface(heatmap.pixels(overlay, x0, y0, x1 - x0, y1 - y0))
+            elif not isinstance(board, ArrayBoard):
+                # only array boards know what changed, the rest would have to redraw the whole board every frame
+                cells = cells_surface(game_inst.colours[board.region(x0, y0, x1 - x0, y1 - y0)])
+            else:
+                game_inst.draw()  # keeps the one pixel per cell surface up to date, then only the part in view is used
+                cells = game_inst.surf.subsurface((x0, y0, x1 - x0, y1 - y0))
+        left, top = round((x0 - camera.x) * zoom), round((y0 - camera.y) * zoom)
+        right, bottom = round((x1 - camera.x) * zoom), round((y1 - camera.y) * zoom)
+        with phase('scale'):
+            surf.blit(pygame.transform.scale(cells, (right - left, bottom - top)), (left, top))
+        if zoom >= GRID_MIN_ZOOM:
+            with phase('grid'):
+                for x in range(x0 + (not unbounded), x1):
+                    line_x = round((x - camera.x) * zoom)
+                    pygame.draw.line(surf, GREY2, (line_x, top), (line_x, bottom))
+                for y in range(y0 + (not unbounded), y1):
+                    line_y = round((y - camera.y) * zoom)
+                    pygame.draw.line(surf, GREY2, (left, line_y), (right, line_y))
+        if overlay == 'neighbours' and zoom >= DIGIT_MIN_ZOOM:
+            with phase('draw'):
+                draw_neighbours(surf, game_inst, camera, x0, y0, x1, y1)
+        return surf
+
+    # each tile of factor x factor cells becomes one pixel, lined up to the tile grid so they don't shimmer when panned
+    factor = 2 ** math.ceil(math.log2(1 / zoom))
+    tx0, ty0 = x0 // factor, y0 // factor
+    tx1, ty1 = -(-x1 // factor), -(-y1 // factor)
+    with phase('draw'):
+        cells = board.region(tx0 * factor, ty0 * factor, (tx1 - tx0) * factor, (ty1 - ty0) * factor)
+        if not unbounded:
+            # cells cut off at the edges are shown as edge rather than as dead cells
+            cells = cells[:x1 - tx0 * factor, :y1 - ty0 * factor]
+            cells = np.pad(cells, ((0, -cells.shape[0] % factor), (0, -cells.shape[1] % factor)))
+        counts = cells.reshape(cells.shape[0] // factor, factor, cells.shape[1] // factor, factor).sum(axis=(1, 3), dtype=np.uint32)
+        density = density_palette()[(counts * 255 + factor * factor - 1) // (factor * factor)]
+        tiles = cells_surface(density)
+    left, top = round((tx0 * factor - camera.x) * zoom), round((ty0 * factor - camera.y) * zoom)
+    tile_size = factor * zoom
+    with phase('scale'):
+        surf.blit(pygame.transform.scale(tiles, (round(density.shape[0] * tile_size), round(density.shape[1] * tile_size))), (left, top))
+    return surf
+
+
+GENERATION_RATES = [2, 5, 15, 25, 50, 100, 250, 1000, None]  # generations per second for each speed, None is as fast as it goes
+RENDER_RATE = 60  # the most frames drawn a second, faster speeds step more than once a frame
+STEP_BUDGET = 0.1  # the most seconds spent stepping in one frame before the rest are dropped to keep up
+
+
+class Scheduler:
+    """a fixed timestep for playing, works out how many generations are owed so stepping isn't tied to drawing"""
+    def __init__(self, rate):
+        self.rate = rate  # generations per second, None for as fast as possible
+        self.owed = 0.0  # generations due but not stepped yet
+        self.last = time.perf_counter()
+
+    def start(self):
+        """called when playing starts, so time spent paused isn't owed"""
+        self.owed = 0.0
+        self.last = time.perf_counter()
+
+    def due(self):
+        """how many whole generations are owed since the last call"""
+        now = time.perf_counter()
+        if self.rate is not None:
+            self.owed += (now - self.last) * self.rate
+        self.last = now
+        generations = int(self.owed)
+        self.owed -= generations
+        return generations
+
+    def wait_time(self):
+        """seconds until there is something to do, a generation owed or a frame to draw"""
+        next_frame = self.last + 1 / RENDER_RATE - time.perf_counter()
+        if self.rate is None:
+            return max(next_frame, 0)
+        return max((1 - self.owed) / self.rate, next_frame, 0)
+
+    def advance(self, game_inst, until_cycle=False):
+        """steps the game by the generations owed, giving up on the rest if they take longer than the frame has
+
+        as fast as possible steps for a whole frame, and until_cycle stops as soon as the board repeats
+        returns how many generations were stepped
+        """
+        start = time.perf_counter()
+        if self.rate is None:
+            self.last = start
+            due, budget = float('inf'), 1 / RENDER_RATE
+        else:
+            due, budget = self.due(), STEP_BUDGET
+        stepped = 0
+        while stepped < due and (stepped == 0 or time.perf_counter() - start < budget):
+            stepped += 1
+            if game_inst.update() and until_cycle:
+                break
+        if stepped < due:
+            self.owed = 0.0  # too far behind, the owed generations are dropped rather than piling up
+        return stepped
+
+
+class SimulationThread(threading.Thread):
+    """plays a board on its own thread, the main loop takes the newest board from it each frame
+
+    the thread has the cycle detector to itself while it runs, and with until_cycle it finishes once the board repeats
+    """
+    def __init__(self, board, scheduler, cycles, until_cycle=False):
+        super().__init__(daemon=True)
+        self.board = board
+        self.generations = 0  # stepped since the last take
+        self.scheduler = scheduler
+        self.cycles = cycles
+        self.until_cycle = until_cycle
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def run(self):
+        board = self.board
+        self.scheduler.start()
+        while not self.stopping.is_set():
+            due = float('inf') if self.scheduler.rate is None else self.scheduler.due()
+            if not due:
+                self.stopping.wait(self.scheduler.wait_time())
+                continue
+            start, stepped, repeated = time.perf_counter(), 0, False
+            while stepped < due and not self.stopping.is_set() and (stepped == 0 or time.perf_counter() - start < 1 / RENDER_RATE):
+                board = board.step()
+                stepped += 1
+                recorder = RECORDER  # main can stop the recording while this thread plays
+                if recorder is not None:
+                    recorder.offer(board)
+                if self.cycles is not None and self.cycles.update(board):
+                    logging.info(f"the board repeats, {self.cycles.describe()}")
+                    repeated = True
+                    break
+            with self.lock:
+                self.board = board
+                self.generations += stepped
+            if repeated and self.until_cycle:
+                return
+
+    def take(self):
+        """the newest board and how many generations were stepped to get it since last time"""
+        with self.lock:
+            generations, self.generations = self.generations, 0
+            return self.board, generations
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
+
+def stop_simulation(simulation, game_inst, published):
+    """stops the worker thread, returning how many generations it stepped past the published board that were kept
+
+    they are only kept if nothing was changed by hand since that board was taken
+    """
+    simulation.stop()
+    if game_inst.board is published and game_inst.cycles is simulation.cycles:
+        game_inst.board, generations = simulation.take()
+        return generations
+    return 0
+
+
+RECORD_FOLDER = 'recordings'  # where F6 puts recordings
+RECORDER = None  # the recording every generation stepped is offered to, None when not recording
+
+
+def start_recording(game_inst, file_name=None, every=RECORD_EVERY, fps=RECORD_FPS):
+    """starts streaming the game to a recording from the board it's on now, named after the time if no name is given"""
+    global RECORDER
+    if file_name is None:
+        file_name = os.path.join(RECORD_FOLDER, time.strftime("recording %Y-%m-%d %H-%M-%S.png"))
+    try:
+        os.makedirs(os.path.dirname(file_name) or '.', exist_ok=True)
+    except OSError:
+        logging.warning(f"could not record to {file_name}")
+        return
+    recorder = Recorder(file_name, every, fps)
+    recorder.start()
+    recorder.add(game_inst.board)
+    RECORDER = recorder
+    logging.info(f"recording every {every} generations to {file_name}")
+
+
+def stop_recording():
+    """finishes the recording, waiting for the frames still queued to be written"""
+    global RECORDER
+    recorder, RECORDER = RECORDER, None
+    try:
+        frames = recorder.close()
+    except Exception:
+        return  # the writer has already said what went wrong
+    logging.info(f"recorded {frames} frames to {recorder.file_name}")
+
+
+AUTOSAVE_INTERVAL = 60  # seconds between autosaves, --autosave=0 turns them off
+AUTOSAVE_KEEP = 5  # how many autosaves are kept, the oldest go first
+AUTOSAVE_FOLDER = 'autosaves'
+AUTOSAVE = None  # the autosaver main is using, so a crash can write the board one last time
+
+
+class Autosaver(threading.Thread):
+    """writes the board out every so often on its own thread, keeping the newest few
+
+    the main loop only copies the board, building and writing the file is done here, a snapshot that is still waiting
+    when a newer one comes in is dropped
+    """
+    def __init__(self, folder=AUTOSAVE_FOLDER, interval=AUTOSAVE_INTERVAL, keep=AUTOSAVE_KEEP):
+        super().__init__(daemon=True)
+        self.folder = folder
+        self.interval = interval
+        self.keep = keep
+        self.game = None  # the game the main loop is showing, for flush
+        self.pending = None  # (board type, cells, layout) waiting to be written
+        self.stopping = False
+        self.condition = threading.Condition()
+        self.saved = time.perf_counter()
+
+    def offer(self, game_inst):
+        """called every frame, copies the board when an autosave is due"""
+        self.game = game_inst
+        if time.perf_counter() - self.saved < self.interval:
+            return
+        self.saved = time.perf_counter()
+        snapshot = (type(game_inst.board), *game_inst.board.snapshot())
+        with self.condition:
+            self.pending = snapshot
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.stopping:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                snapshot, self.pending = self.pending, None
+            self.write(*snapshot)
+
+    def write(self, board_type, cells, layout):
+        """writes one autosave and deletes the ones past keep, returning the file name or None if it couldn't"""
+        file_name = os.path.join(self.folder, time.strftime("autosave %Y-%m-%d %H-%M-%S.pbrd"))
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            write_pattern(file_name, board_type.from_snapshot(cells, layout))
+            for old in sorted(glob.glob(os.path.join(glob.escape(self.folder), "autosave *.pbrd")))[:-self.keep]:
+                os.remove(old)
+        except OSError:
+            logging.warning(f"could not autosave to {file_name}")
+            return None
+        return file_name
+
+    def stop(self):
+        """lets the write going on finish"""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.is_alive():
+            self.join()
+
+    def flush(self):
+        """writes the board as it is now, on this thread, for when the program is going down"""
+        self.stop()
+        if self.game is None:
+            return None
+        return self.write(type(self.game.board), *self.game.board.snapshot())
+
+
+TIMING_WINDOW = 240  # how many frames the timings and percentiles are worked out over
+TIMING_LOG_INTERVAL = 5  # seconds between logging the timing percentiles
+OVERLAY_INTERVAL = 0.25  # seconds between redrawing the timing overlay
+PROFILE_FRAMES = 120  # how many frames F10 captures with cProfile
+
+
+class FrameTimer:
+    """times each phase of the main loop, for the F3 overlay, the log and F10 cProfile captures"""
+    def __init__(self, window=TIMING_WINDOW):
+        self.phases = collections.defaultdict(lambda: collections.deque(maxlen=window))  # seconds per phase per frame
+        self.frame_ends = collections.deque(maxlen=window)  # perf_counter at the end of each frame
+        self.generations = collections.deque(maxlen=window)  # generations stepped in each frame
+        self.current = collections.Counter()  # the phases of the frame going on now
+        self.stepped = 0
+        self.logged = time.perf_counter()
+        self.profile = None
+        self.profile_frames = 0
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - start
+
+    def stepped_generations(self, generations):
+        self.stepped += generations
+
+    def end_frame(self, log=False):
+        now = time.perf_counter()
+        for name, seconds in self.current.items():
+            self.phases[name].append(seconds)
+        self.frame_ends.append(now)
+        self.generations.append(self.stepped)
+        self.current, self.stepped = collections.Counter(), 0
+        if log and now - self.logged > TIMING_LOG_INTERVAL:
+            self.log()
+        if self.profile is not None:
+            self.profile_frames -= 1
+            if self.profile_frames <= 0:
+                self.stop_profile()
+
+    def fps(self):
+        if len(self.frame_ends) < 2:
+            return 0
+        return (len(self.frame_ends) - 1) / (self.frame_ends[-1] - self.frame_ends[0])
+
+    def generations_per_second(self):
+        if len(self.frame_ends) < 2:
+            return 0
+        return sum(list(self.generations)[1:]) / (self.frame_ends[-1] - self.frame_ends[0])
+
+    def percentiles(self, name, points=(50, 90, 99)):
+        """the percentiles of how long a phase took in ms, over the frames it happened in"""
+        return np.percentile(np.array(self.phases[name]) * 1000, points)
+
+    def log(self):
+        self.logged = time.perf_counter()
+        lines = [f"{self.fps():.1f} fps, {self.generations_per_second():.1f} generations/s, ms at p50/p90/p99:"]
+        for name, times in self.phases.items():
+            if times:
+                lines.append(f"  {name:<8} " + " ".join(f"{ms:8.3f}" for ms in self.percentiles(name)))
+        logging.debug("\n".join(lines))
+
+    def start_profile(self, frames=PROFILE_FRAMES):
+        if self.profile is not None:
+            return
+        logging.info(f"profiling the next {frames} frames")
+        self.profile = cProfile.Profile()
+        self.profile_frames = frames
+        self.profile.enable()
+
+    def stop_profile(self):
+        self.profile.disable()
+        file_name = time.strftime("profile-%Y%m%d-%H%M%S.prof")
+        self.profile.dump_stats(file_name)
+        report = io.StringIO()
+        pstats.Stats(self.profile, stream=report).sort_stats('cumulative').print_stats(15)
+        logging.info(f"profile saved to {file_name}\n{report.getvalue()}")
+        self.profile = None
+
+
+def draw_overlay(frame_timer, population):
+    """the timing overlay, fps, generations/s, live cells and the median ms of each phase"""
+    lines = [f"{frame_timer.fps():.1f} fps", f"{frame_timer.generations_per_second():.1f} generations/s",
+             f"{population} live cells"]
+    lines += [f"{name} {frame_timer.percentiles(name, 50):.2f} ms" for name, times in frame_timer.phases.items() if times]
+    texts = [SETTINGS_FONT.render(line, True, WHITE) for line in lines]
+    surf = pygame.Surface((max(text.get_width() for text in texts) + 10, sum(text.get_height() for text in texts) + 10))
+    surf.set_alpha(200)
+    y = 5
+    for text in texts:
+        surf.blit(text, (5, y))
+        y += text.get_height()
+    return surf
+
+
+def ask_rule(rule):
+    """asks for a rulestring in a little window, returning the new rule or None if nothing good was entered"""
+    import tkinter
+    entered = []
+
+    def pressed(*_):
+        entered.append(ent.get())
+        top.destroy()
+    top = tkinter.Toplevel(tk_root())
+    top.resizable(False, False)
+    top.geometry("300x200")
+    top.title("enter rule")
+    tkinter.Label(top, text=f"enter a rule like B36/S23\nor one of {', '.join(RULES)}", wraplength=280).place(relx=0.5, rely=0.25, anchor='center')
+    ent = tkinter.Entry(top, width=20, justify='center')
+    ent.insert(0, str(rule))
+    ent.place(relx=0.5, rely=0.55, anchor='center')
+    ent.focus_set()
+    btn = tkinter.Button(top, text="submit", command=pressed)
+    btn.place(relx=0.5, rely=0.8, anchor='center')
+    top.bind("<Return>", pressed)
+    top.wait_window()
+    if not entered:
+        return None
+    try:
+        return Rule.parse(entered[0])
+    except ValueError as error:
+        logging.error(error)
+        return None
+
+
+def ask_size():
+    """asks for a new board size in a little window, returning the width and height typed in or None if it was closed"""
+    import tkinter
+    entered = []
+
+    def pressed(*_):
+        entered.append((ent1.get(), ent2.get()))
+        top.destroy()
+    top = tkinter.Toplevel(tk_root())
+    top.resizable(False, False)
+    top.geometry("300x240")
+    top.title("enter dimensions")
+    tkinter.Label(top, text="enter dimensions\n(this will clear the board)\n\n warning: large boards will run slowly\nrun with --workers=N to step them on N threads").place(relx=0.5, rely=0.2, anchor='center')
+    tkinter.Label(top, text="width").place(relx=0.40, rely=0.45, anchor='center')
+    tkinter.Label(top, text="height").place(relx=0.60, rely=0.45, anchor='center')
+    ent1 = tkinter.Entry(top, width=5, justify='center')
+    ent1.place(relx=0.4, rely=0.6, anchor='center')
+    ent1.focus_set()
+    ent2 = tkinter.Entry(top, width=5, justify='center')
+    ent2.place(relx=0.6, rely=0.6, anchor='center')
+    btn = tkinter.Button(top, text="submit", command=pressed)
+    btn.place(relx=0.5, rely=0.82, anchor='center')
+    top.bind("<Return>", pressed)
+    top.wait_window()
+    return entered[0] if entered else None
+
+
+INDEX_FOLDER = '.index'  # where a pattern folder's index and thumbnails are kept, inside the folder
+INDEX_SAVE_INTERVAL = 50  # the index is written after this many new entries, so a long first index isn't lost
+CARD_WIDTH, CARD_HEIGHT = 200, 250  # the size of each pattern in the browser, before RATIO
+THUMBNAIL_BOX = 160  # thumbnails are scaled up by a whole factor to fit in this square
+OPEN_OTHER = object()  # what the browser returns when a file from somewhere else is wanted
+
+
+class PatternLibrary(threading.Thread):
+    """an index of the pattern files in a folder, their size, population, rule, hash and a thumbnail, kept on disk
+
+    entries are checked against each file's mtime and size so only new or changed files are read again, and that
+    happens on this thread, so the browser shows whatever is indexed already straight away
+    the folder is looked at again whenever rescan is called, which the browser does each time it opens
+    """
+    def __init__(self, folder):
+        super().__init__(daemon=True)
+        self.folder = folder
+        self.index_folder = os.path.join(folder, INDEX_FOLDER)
+        self.index_file = os.path.join(self.index_folder, 'index.json')
+        self.lock = threading.Lock()
+        self.entries = {}  # file name -> what the index knows about it
+        self.total = None  # how many pattern files there are, once the folder has been looked at
+        self.version = 0  # goes up whenever the entries change, so the browser knows to draw again
+        self.wanted = threading.Event()  # set when the folder should be looked at again
+
+    def run(self):
+        try:
+            with open(self.index_file) as file:
+                known = json.load(file)
+        except (OSError, ValueError):
+            known = {}
+        while True:
+            self.scan(known)
+            self.wanted.wait()
+            self.wanted.clear()
+            with self.lock:
+                known = dict(self.entries)
+
+    def rescan(self):
+        """looks for files added, changed or removed since the last look, only stat-ing the ones that are unchanged"""
+        self.wanted.set()
+
+    def scan(self, known):
+        """indexes the folder, known is what the index had before, only new or changed files are read"""
+        try:
+            names = sorted(name for name in os.listdir(self.folder) if os.path.splitext(name)[1] in PATTERN_EXTENSIONS)
+        except OSError:
+            logging.warning(f"could not look in {self.folder} for patterns")
+            names = []
+        entries, changed = {}, []
+        for name in names:
+            entry = known.get(name)
+            try:
+                stat = os.stat(os.path.join(self.folder, name))
+            except OSError:
+                continue  # removed since the folder was listed
+            if (entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns
+                    and (entry.get('thumbnail') is None or os.path.exists(os.path.join(self.index_folder, entry['thumbnail'])))):
+                entries[name] = entry
+            else:
+                changed.append((name, stat))
+        with self.lock:
+            self.entries = entries
+            self.total = len(names)
+            self.version += 1
+
+        for i, (name, stat) in enumerate(changed, 1):
+            entry = self.index(name, stat)
+            with self.lock:
+                self.entries[name] = entry
+                self.version += 1
+            if i % INDEX_SAVE_INTERVAL == 0:
+                self.save()
+        if changed or set(known) != set(self.entries):
+            self.save()
+            for name in set(known) - set(self.entries):
+                with contextlib.suppress(OSError, TypeError):
+                    os.remove(os.path.join(self.index_folder, known[name].get('thumbnail')))
+
+    def index(self, name, stat):
+        """reads one file for its entry, a file that isn't a pattern gets an entry too so it isn't read every time"""
+        entry = {'name': name, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        try:
+            summary = pattern_summary(os.path.join(self.folder, name))
+        except (DimensionError, TypeError, ValueError, OSError):
+            entry['error'] = True
+            return entry
+        levels = summary.pop('thumbnail')
+        entry.update(summary)
+        if levels.size:
+            image = pygame.Surface(levels.shape, 0, 8)
+            image.set_palette([GREY1.lerp(WHITE, value / 255) for value in range(256)])  # drawn in the board's colours
+            pygame.surfarray.blit_array(image, levels)
+            entry['thumbnail'] = name + '.png'
+            try:
+                os.makedirs(self.index_folder, exist_ok=True)
+                with replacing(os.path.join(self.index_folder, entry['thumbnail'])) as temp_name, open(temp_name, 'wb') as file:
+                    pygame.image.save(image, file, 'png')
+            except (OSError, pygame.error):
+                entry['thumbnail'] = None
+        return entry
+
+    def save(self):
+        with self.lock:
+            entries = dict(self.entries)
+        try:
+            os.makedirs(self.index_folder, exist_ok=True)
+            with replacing(self.index_file) as temp_name, open(temp_name, 'w') as file:
+                json.dump(entries, file, indent=1)
+        except OSError:
+            logging.warning(f"could not save the pattern index to {self.index_file}")
+
+    def listing(self):
+        """the entries indexed so far that are patterns, by name, how many files there are and the version"""
+        with self.lock:
+            entries = [entry for entry in self.entries.values() if not entry.get('error')]
+            return sorted(entries, key=lambda entry: entry['name']), self.total, self.version
+
+
+def browser_rects(screen_width, screen_height, count, scroll):
+    """where the browser's buttons and each pattern's card go, cards are laid out in rows below the buttons"""
+    buttons = {
+        'other': pygame.Rect((1225*RATIO, 20*RATIO, 175*RATIO, 90*RATIO)),
+        'close': pygame.Rect((1475*RATIO, 20*RATIO, 75*RATIO, 90*RATIO)),
+    }
+    columns = max(1, int((screen_width - 40*RATIO) // (CARD_WIDTH*RATIO)))
+    top = screen_height * 0.148 + 20*RATIO - scroll
+    cards = [pygame.Rect(40*RATIO + i % columns * CARD_WIDTH*RATIO, top + i // columns * CARD_HEIGHT*RATIO,
+                         (CARD_WIDTH - 20)*RATIO, (CARD_HEIGHT - 20)*RATIO) for i in range(count)]
+    return buttons, cards
+
+
+def draw_browser(surf, library, entries, total, scroll, hovered, thumbnails):
+    """the whole browser, drawn over the window"""
+    screen_width, screen_height = surf.get_size()
+    buttons, cards = browser_rects(screen_width, screen_height, len(entries), scroll)
+    surf.fill(GREY3)
+    for entry, rect in zip(entries, cards):
+        if rect.bottom < screen_height * 0.148 or rect.top > screen_height:
+            continue
+        pygame.draw.rect(surf, GREY0, rect, 5)
+        pygame.draw.rect(surf, GREY2_5 if entry['name'] == hovered else GREY2, rect)
+        name = entry.get('thumbnail')
+        if name is not None and name not in thumbnails:
+            try:
+                thumbnails[name] = pygame.image.load(os.path.join(library.index_folder, name))
+            except (OSError, pygame.error):
+                thumbnails[name] = None
+        image = thumbnails.get(name)
+        box = pygame.Rect(0, 0, THUMBNAIL_BOX*RATIO, THUMBNAIL_BOX*RATIO)
+        box.midtop = (rect.centerx, rect.top + 10*RATIO)
+        pygame.draw.rect(surf, GREY1, box)
+        if image is not None:
+            factor = max(1, int(min(box.width / image.get_width(), box.height / image.get_height())))
+            image = pygame.transform.scale(image, (image.get_width() * factor, image.get_height() * factor))
+            surf.blit(image, image.get_rect(center=box.center))
+        lines = [os.path.splitext(entry['name'])[0], f"{entry['width']}x{entry['height']}, {entry['population']} cells"]
+        if entry['rule'] != str(CONWAY):
+            lines[1] += f", {entry['rule']}"
+        y = box.bottom + 5*RATIO
+        for line in lines:
+            text = SETTINGS_FONT.render(line, False, BLACK)
+            if text.get_width() > rect.width - 10*RATIO:
+                text = text.subsurface((0, 0, rect.width - 10*RATIO, text.get_height()))
+            surf.blit(text, text.get_rect(midtop=(rect.centerx, y)))
+            y += text.get_height()
+
+    # the buttons go over any cards scrolled up under them
+    pygame.draw.rect(surf, GREY3, (0, 0, screen_width, screen_height * 0.148))
+    pygame.draw.line(surf, GREY1, (0, screen_height*0.148), (screen_width, screen_height*0.148))
+    heading = "patterns" if total is None or len(library.entries) >= total else f"patterns, indexing {len(library.entries)} of {total}"
+    surf.blit(FONT.render(heading, True, BLACK), (40*RATIO, 45*RATIO))
+    for name, label in (('other', "open file..."), ('close', "close")):
+        pygame.draw.rect(surf, GREY0, buttons[name], 5)
+        pygame.draw.rect(surf, GREY2_5 if name == hovered else GREY2, buttons[name])
+        text = SETTINGS_FONT.render(label, False, BLACK)
+        surf.blit(text, text.get_rect(center=buttons[name].center))
+
+
+def browse_patterns(surf, library):
+    """the pattern browser, shown over the whole window until a pattern is picked or it's closed
+
+    returns the picked file's path, OPEN_OTHER to ask for a file with the file dialog, or None
+    """
+    library.rescan()  # picks up patterns saved or changed since it was last open
+    thumbnails = {}  # loaded thumbnail images, by file name
+    scroll = 0
+    drawn = None
+    while True:
+        events = [pygame.event.wait(100)] + pygame.event.get()  # wakes up now and then to show newly indexed patterns
+        entries, total, version = library.listing()
+        screen_width, screen_height = surf.get_size()
+        buttons, cards = browser_rects(screen_width, screen_height, len(entries), scroll)
+        pos = pygame.mouse.get_pos()
+        for event in events:
+            if event.type == QUIT:
+                pygame.event.post(event)  # the main loop quits too
+                return None
+            elif event.type == KEYDOWN and event.key == K_ESCAPE:
+                return None
+            elif event.type == MOUSEWHEEL:
+                bottom = cards[-1].bottom + scroll if cards else 0
+                scroll = min(max(scroll - event.y * CARD_HEIGHT*RATIO / 2, 0), max(0, bottom - screen_height + 20*RATIO))
+            elif event.type == MOUSEBUTTONDOWN and event.button == 1:
+                if buttons['close'].collidepoint(pos):
+                    return None
+                if buttons['other'].collidepoint(pos):
+                    return OPEN_OTHER
+                if pos[1] > screen_height * 0.148:
+                    for entry, rect in zip(entries, cards):
+                        if rect.collidepoint(pos):
+                            return os.path.join(library.folder, entry['name'])
+        buttons, cards = browser_rects(screen_width, screen_height, len(entries), scroll)
+        hovered = button_at(buttons, pos)
+        if hovered is None and pos[1] > screen_height * 0.148:
+            hovered = next((entry['name'] for entry, rect in zip(entries, cards) if rect.collidepoint(pos)), None)
+        state = (version, scroll, hovered, screen_width, screen_height)
+        if state != drawn:
+            draw_browser(surf, library, entries, total, scroll, hovered, thumbnails)
+            pygame.display.flip()
+            drawn = state
+
+
+def on_board(game_inst, x, y):
+    """if a board position can be drawn on, anywhere on an unbounded plane"""
+    return isinstance(game_inst.board, ChunkBoard) or (0 <= x < game_inst.board_width and 0 <= y < game_inst.board_height)
 
 
 def resource_path(relative_path):
@@ -280,45 +1418,135 @@ def resource_path(relative_path):
 
 
 def main():
-    global SCREEN_WIDTH, SCREEN_HEIGHT, RATIO, FONT, SETTINGS_FONT
+    global SCREEN_WIDTH, SCREEN_HEIGHT, RATIO, BoardType, RULE, TOPOLOGY, AUTOSAVE, WATCH_CYCLES
+    startup = StartupTimer()
+    startup.mark('imports')
+    init_ui()
+    startup.mark('ui')
+    engine = get_option('engine', 'array')
+    if engine in ENGINES:
+        BoardType = ENGINES[engine]
+    else:
+        logging.warning(f"unknown engine {engine}, using array")
+    topology = get_option('topology', 'torus')
+    if topology not in TOPOLOGIES:
+        logging.warning(f"unknown topology {topology}, using torus")
+    elif topology == 'plane':
+        BoardType = ChunkBoard  # only chunks can grow without bounds
+    else:
+        TOPOLOGY = TOPOLOGIES[topology]
+    try:
+        RULE = Rule.parse(get_option('rule', str(CONWAY)))
+        if BoardType is ChunkBoard and 0 in RULE.birth:
+            raise ValueError("a rule with births on 0 neighbours would fill the whole plane")
+    except ValueError as error:
+        RULE = CONWAY
+        logging.error(f"{error}, using {CONWAY}")
+    try:
+        set_workers(int(get_option('workers', 1)))
+    except ValueError:
+        logging.error("workers must be a number")
+    try:
+        history_budget = int(float(get_option('history', HISTORY_BUDGET / 1024 / 1024)) * 1024 * 1024)
+    except ValueError:
+        logging.error("history must be a number of megabytes")
+        history_budget = HISTORY_BUDGET
+    try:
+        autosave_interval = float(get_option('autosave', AUTOSAVE_INTERVAL))
+        autosave_keep = max(1, int(get_option('autosave-keep', AUTOSAVE_KEEP)))
+    except ValueError:
+        logging.error("autosave must be a number of seconds and autosave-keep a number of files")
+        autosave_interval, autosave_keep = AUTOSAVE_INTERVAL, AUTOSAVE_KEEP
+    if autosave_interval > 0:
+        AUTOSAVE = Autosaver(get_option('autosave-folder', AUTOSAVE_FOLDER), autosave_interval, autosave_keep)
+        AUTOSAVE.start()
+    WATCH_CYCLES = 'cycles' in sys.argv or 'pause-on-cycle' in sys.argv  # logs when the board repeats
+    library = PatternLibrary(get_option('patterns', resource_path('patterns')))  # indexes the patterns while the game runs
+    library.start()
     game = Gol()
     if 'fullscreen' in sys.argv:
         surf = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), FULLSCREEN)
     else:
         surf = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), RESIZABLE)
-    pygame.display.set_caption("game of life in python")
+    pygame.display.set_caption(f"game of life in python ({RULE})")
     # creating window icon
     icon = pygame.Surface((32, 32))
     icon.fill(BLACK)
     img = pygame.transform.scale(pygame.image.load(resource_path('icon.png')), (30, 30))
     icon.blit(img, (1, 1))
     pygame.display.set_icon(icon)
+    startup.mark('window')
 
-    game_rect, step_rect, play_rect, clear_rect, quit_rect, save_as_rect, load_rect, back_rect, for_rect, slow_rect, speed_rect, size_rect =\
-        [VoidEntity()]*12  # init for some vars to avoid errors
     playing = False  # if the program is currently running
     playing_ = False  # if the game should be playing but can't bc the user is drawing
     drawing = 0  # {0: not drawing, 1: adding, 2: removing}
-    timer = time.perf_counter()  # timing when an generation should happen
-    frame_times = [1/2, 1/5, 1/15, 1/25, 1/50, 1/100]
-    frame_index = 2
-    frame_time = frame_times[frame_index]  # how long between each gen. at a minimum
-    memory = Memory()  # where the back and forward button data is stored
+    speed = 2  # which of GENERATION_RATES is used when playing
+    scheduler = Scheduler(GENERATION_RATES[speed])  # works out how many generations each frame steps
+    threaded = 'threaded' in sys.argv  # play on a worker thread that hands boards to the main loop
+    simulation = None  # the worker thread while it's playing
+    pause_on_cycle = 'pause-on-cycle' in sys.argv  # stop playing once the board repeats
+    was_playing = False
+    jump_power = 4  # the jump button moves on 2^jump_power generations
+    memory = Memory(history_budget)  # where the back and forward button data is stored
+    frame_timer = FrameTimer()
+    show_timings = False  # if the timing overlay is up, toggled with F3
+    overlay = None  # which of OVERLAYS is drawn over the board, changed with F4
+    heatmap = Heatmap()
+    log_timings = 'timings' in sys.argv  # log the timing percentiles even without the overlay
+    try:
+        profile_frames = int(get_option('profile-frames', PROFILE_FRAMES))
+    except ValueError:
+        logging.error("profile-frames must be a number")
+        profile_frames = PROFILE_FRAMES
+    try:
+        record_every = max(1, int(get_option('record-every', RECORD_EVERY)))
+        record_fps = min(max(1, int(get_option('record-fps', RECORD_FPS))), (1 << 16) - 1)
+    except ValueError:
+        logging.error("record-every must be a number of generations and record-fps a number of frames")
+        record_every, record_fps = RECORD_EVERY, RECORD_FPS
+    overlay_drawn = time.perf_counter()
     memory.store(game)  # adding original state to memory
 
     try:
-        if sys.argv[1][-4:] == '.brd':
+        if os.path.splitext(sys.argv[1])[1] in PATTERN_EXTENSIONS:
             game = load(game, sys.argv[1])
     except IndexError:
         pass
+    if get_option('record') is not None:
+        start_recording(game, get_option('record'), record_every, record_fps)
+    startup.mark('board')
+
+    buttons = toolbar_rects()
+    game_rect = board_rect(game)
+    camera = Camera()  # the part of the board being looked at, zoomed with the mouse wheel and moved by right dragging
+    panning = False
+    drawn_layout, drawn_toolbar, drawn_game = None, None, None  # what is on the screen right now
+    shown_rule = RULE  # the rule in the window's title
+    board_dirty = True  # if the board has changed since it was last drawn
 
     running = True
     while running:
+        # sleep until something happens, or until the next generation is due
+        if playing:
+            wait_time = scheduler.wait_time() if simulation is None else 1 / RENDER_RATE
+            x = [pygame.event.wait(max(1, int(1000 * wait_time)))]
+        elif show_timings:
+            x = [pygame.event.wait(int(1000 * OVERLAY_INTERVAL))]
+        else:
+            x = [pygame.event.wait()]
+        frame_start = time.perf_counter()
+        x += pygame.event.get()
+        if simulation is not None:
+            # everything below sees the newest board the worker thread has finished
+            game.board, generations = simulation.take()
+            published = game.board
+            frame_timer.stepped_generations(generations)
+            board_dirty = board_dirty or generations > 0
         pos = pygame.mouse.get_pos()
-        # get event
-        x = pygame.event.get()
         pressed_mods = pygame.key.get_mods()
         for event in x:
+            if event.type in (KEYDOWN, MOUSEBUTTONDOWN):
+                board_dirty = True
             if event.type == QUIT:
                 running = False
             elif event.type == KEYDOWN:
@@ -327,9 +1555,22 @@ def main():
                     playing = False
                     game.reset()
                 if event.key == K_SPACE:
+                    if simulation is not None:
+                        # the thread is stopped first, so it isn't stepping the board and its cycles at the same time
+                        frame_timer.stepped_generations(stop_simulation(simulation, game, published))
+                        simulation = None
                     memory.store(game)
                     playing = False
                     game.play_step()
+                    frame_timer.stepped_generations(1)
+                if event.key == K_j:
+                    if simulation is not None:
+                        # the thread is stopped first, so it isn't stepping the board and its cycles at the same time
+                        frame_timer.stepped_generations(stop_simulation(simulation, game, published))
+                        simulation = None
+                    memory.store(game)
+                    playing = False
+                    frame_timer.stepped_generations(jump(game, jump_power))
                 if event.key == K_p:
                     if not playing:
                         memory.store(game)
@@ -338,19 +1579,50 @@ def main():
                     logging.info("playing/paused")
                 if event.key == K_c:
                     if pressed_mods & KMOD_CTRL:
-                        top = tkinter.Tk()
-                        top.withdraw()
-                        user = askyesno("do you want to quit?", message="are you sure you want to quit?")
-                        top.destroy()
-                        if user:
+                        if confirm_quit():
                             running = False
                 if event.key == K_F11:
                     pygame.display.toggle_fullscreen()
-            elif event.type == MOUSEBUTTONDOWN:
+                if event.key == K_r:
+                    playing, playing_ = False, False
+                    rule = ask_rule(game.board.rule)
+                    if rule is not None and rule != game.board.rule:
+                        memory.store(game)
+                        try:
+                            game.set_rule(rule)
+                        except ValueError as error:
+                            logging.error(error)
+                if event.key == K_HOME:
+                    camera.fit(game, game_rect)
+                if event.key == K_F4:
+                    overlay = OVERLAYS[(OVERLAYS.index(overlay) + 1) % len(OVERLAYS)]
+                    heatmap = Heatmap()
+                    logging.info(f"overlay {overlay or 'off'}")
+                    board_dirty = True
+                if event.key == K_F3:
+                    show_timings = not show_timings
+                if event.key == K_F10:
+                    frame_timer.start_profile(profile_frames)
+                if event.key == K_F6:
+                    if RECORDER is None:
+                        start_recording(game, every=record_every, fps=record_fps)
+                    else:
+                        stop_recording()
+            elif event.type == MOUSEWHEEL:
                 if game_rect.collidepoint(pos):
-                    x, y = pos
-                    x, y = x - game_rect.left, y - game_rect.top
-                    x, y = int(game.board_width * x / game_rect.width), int(game.board_height * y / game_rect.height)
+                    camera.zoom_at(pos, game_rect, ZOOM_STEP ** event.y, game)
+                    board_dirty = True
+            elif event.type == MOUSEBUTTONDOWN and event.button in (4, 5):
+                pass  # the old style mouse wheel events, the wheel is done with MOUSEWHEEL
+            elif event.type == MOUSEBUTTONDOWN and event.button in (2, 3):
+                panning = game_rect.collidepoint(pos)
+            elif event.type == MOUSEMOTION:
+                if panning:
+                    camera.pan(event.rel, game_rect, game)
+                    board_dirty = True
+            elif event.type == MOUSEBUTTONDOWN:
+                if game_rect.collidepoint(pos) and on_board(game, *camera.cell_at(pos, game_rect)):
+                    x, y = camera.cell_at(pos, game_rect)
                     if game.board[x][y] == 1:
                         playing_ = playing
                         playing = False
@@ -361,105 +1633,89 @@ def main():
                         playing = False
                         drawing = 1
                         memory.store(game)
-                elif step_rect.collidepoint(pos):
+                elif buttons['step'].collidepoint(pos):
+                    if simulation is not None:
+                        # the thread is stopped first, so it isn't stepping the board and its cycles at the same time
+                        frame_timer.stepped_generations(stop_simulation(simulation, game, published))
+                        simulation = None
                     memory.store(game)
                     playing = False
                     game.play_step()
-                elif play_rect.collidepoint(pos):
+                    frame_timer.stepped_generations(1)
+                elif buttons['jump'].collidepoint(pos):
+                    if simulation is not None:
+                        # the thread is stopped first, so it isn't stepping the board and its cycles at the same time
+                        frame_timer.stepped_generations(stop_simulation(simulation, game, published))
+                        simulation = None
+                    memory.store(game)
+                    playing = False
+                    frame_timer.stepped_generations(jump(game, jump_power))
+                elif buttons['less_jump'].collidepoint(pos):
+                    if jump_power > 0:
+                        jump_power -= 1
+                elif buttons['more_jump'].collidepoint(pos):
+                    if jump_power < MAX_JUMP_POWER:
+                        jump_power += 1
+                elif buttons['play'].collidepoint(pos):
                     if not playing:
                         memory.store(game)
                         playing_ = True
                     playing = not playing
                     logging.info("playing/paused")
-                elif clear_rect.collidepoint(pos):
+                elif buttons['clear'].collidepoint(pos):
                     memory.store(game)
                     game.reset()
                     playing = False
-                elif quit_rect.collidepoint(pos):
-                    top = tkinter.Tk()
-                    top.withdraw()
-                    user = askyesno("do you want to quit?", message="are you sure you want to quit?")
-                    top.destroy()
-                    if user:
+                elif buttons['quit'].collidepoint(pos):
+                    if confirm_quit():
                         running = False
-                elif save_as_rect.collidepoint(pos):
-                    top = tkinter.Tk()
-                    top.withdraw()
-                    file_name = asksaveasfilename(parent=top)
-                    top.destroy()
-                    str_ = str(game.board_width) + " " + str(game.board_height) + " "
-                    for x, rows in enumerate(game.board):
-                        for y, _ in enumerate(rows):
-                            str_ += str(game.board[x][y])
-                    try:
-                        file = open(file_name+'.brd', 'x')
-                        file.close()
-                    except FileExistsError:
-                        pass
-                    with open(file_name+'.brd', 'w') as file:
-                        file.write(str_)
-
-                elif load_rect.collidepoint(pos):
+                elif buttons['save_as'].collidepoint(pos):
+                    file_name = ask_save_name()
+                    if file_name:
+                        if os.path.splitext(file_name)[1] not in PATTERN_EXTENSIONS:
+                            file_name += '.brd'
+                        save(game, file_name)
+
+                elif buttons['load'].collidepoint(pos):
                     playing = False
                     playing_ = False
-                    top = tkinter.Tk()
-                    top.withdraw()
-                    file_name = askopenfile(parent=top)
-                    if file_name is None:
-                        file_name = VoidEntity()
-                    top.destroy()
-
-                    memory.store(game)
-                    game = load(game, file_name.name)
+                    file_name = browse_patterns(surf, library)
+                    drawn_layout = None  # the browser was drawn over everything
+                    if file_name is OPEN_OTHER:
+                        file_name = ask_open_name()
+                    if file_name is not None:
+                        memory.store(game)
+                        game = load(game, file_name)
 
-                elif back_rect.collidepoint(pos):
+                elif buttons['back'].collidepoint(pos):
                     playing = False
                     if memory.is_empty()[0]:
                         logging.info("no more on stack")
                     else:
                         game = memory.get_past(game)
 
-                elif for_rect.collidepoint(pos):
+                elif buttons['forward'].collidepoint(pos):
                     playing = False
                     if memory.is_empty()[1]:
                         logging.info("no more on stack")
                     else:
                         game = memory.get_forward(game)
 
-                elif slow_rect.collidepoint(pos):
-                    if frame_index > 0:
-                        frame_index -= 1
-                        frame_time = frame_times[frame_index]
-
-                elif speed_rect.collidepoint(pos):
-                    if frame_index < len(frame_times) - 1:
-                        frame_index += 1
-                        frame_time = frame_times[frame_index]
-
-                elif size_rect.collidepoint(pos):
-                    new_size = [game.board_width, game.board_height]
-
-                    def pressed(*_):
-                        new_size[0], new_size[1] = ent1.get(), ent2.get()
-                        top.destroy()
-                    top = tkinter.Tk()
-                    top.resizable(False, False)
-                    top.geometry("300x240")
-                    top.title("enter dimensions")
-                    tkinter.Label(top, text="enter dimensions\n(this will clear the board)\n\n warning: entering too large number will cause a crash\nstick to 2 digit numbers to be safe").place(relx=0.5, rely=0.2, anchor='center')
-                    tkinter.Label(top, text="width").place(relx=0.40, rely=0.45, anchor='center')
-                    tkinter.Label(top, text="height").place(relx=0.60, rely=0.45, anchor='center')
-                    ent1 = tkinter.Entry(top, width=3, justify='center')
-                    ent1.place(relx=0.4, rely=0.6, anchor='center')
-                    ent1.focus_set()
-                    ent2 = tkinter.Entry(top, width=3, justify='center')
-                    ent2.place(relx=0.6, rely=0.6, anchor='center')
-                    btn = tkinter.Button(top, text="submit", command=pressed)
-                    btn.place(relx=0.5, rely=0.82, anchor='center')
-                    top.bind("<Return>", pressed)
-                    tkinter.mainloop()
-                    del ent1, ent2, top
-                    if len(new_size) == 2:
+                elif buttons['slow'].collidepoint(pos):
+                    if speed > 0:
+                        speed -= 1
+                        scheduler.rate = GENERATION_RATES[speed]
+                        logging.info(f"speed {scheduler.rate or 'as fast as possible'} generations/s")
+
+                elif buttons['speed'].collidepoint(pos):
+                    if speed < len(GENERATION_RATES) - 1:
+                        speed += 1
+                        scheduler.rate = GENERATION_RATES[speed]
+                        logging.info(f"speed {scheduler.rate or 'as fast as possible'} generations/s")
+
+                elif buttons['size'].collidepoint(pos):
+                    new_size = ask_size()
+                    if new_size is not None:
                         try:
                             new_size = int(new_size[0]), int(new_size[1])
                         except ValueError:
@@ -470,6 +1726,7 @@ def main():
                             game = Gol(*new_size)
 
             elif event.type == MOUSEBUTTONUP:
+                panning = False
                 if drawing != 0:
                     drawing = 0
                 if playing_:
@@ -483,8 +1740,10 @@ def main():
                 SCREEN_HEIGHT = int(new_display_info.current_w * (900/1600))
                 pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), RESIZABLE)
                 RATIO = Multiplier(SCREEN_WIDTH / 1600)
-                FONT = pygame.font.SysFont('arial', 30*RATIO)
-                SETTINGS_FONT = pygame.font.SysFont('arial', 24*RATIO)
+                make_fonts()
+
+            elif event.type == VIDEOEXPOSE:
+                drawn_layout = None  # the window was covered up, so draw all of it again
 
             elif event.type == WINDOWMAXIMIZED:
                 new_display_info = pygame.display.Info()
@@ -492,174 +1751,137 @@ def main():
                 SCREEN_WIDTH = int(new_display_info.current_h * (1600/900))
                 pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), RESIZABLE)
                 RATIO = Multiplier(SCREEN_WIDTH / 1600)
-                FONT = pygame.font.SysFont('arial', 30*RATIO)
-                SETTINGS_FONT = pygame.font.SysFont('arial', 24*RATIO)
-
-        if pygame.mouse.get_pressed(3)[0]:
-            x, y = pygame.mouse.get_pos()
-            x, y = x - game_rect.left, y - game_rect.top
-            x, y = int(game.board_width * x / game_rect.width), int(game.board_height * y / game_rect.height)
+                make_fonts()
+
+        if simulation is not None and pause_on_cycle and simulation.cycles is not None and simulation.cycles.found \
+                and not simulation.is_alive():
+            playing = False  # the thread finished on the generation the board repeated
+        if simulation is not None and (not playing or game.board is not published):
+            frame_timer.stepped_generations(stop_simulation(simulation, game, published))
+            board_dirty = True
+            simulation = None
+
+        x, y = camera.cell_at(pygame.mouse.get_pos(), game_rect)
+        if pygame.mouse.get_pressed(3)[0] and on_board(game, x, y):
             if drawing == 1:
-                game.board[x][y] = 1
+                game.set_cell(x, y, 1)
+                board_dirty = True
             elif drawing == 2:
-                game.board[x][y] = 0
-
-        if playing and (time.perf_counter() - timer) > frame_time:
-            timer = time.perf_counter()
-            game.play_step()
-
-        surf.fill(GREY3)
-
-        game.draw()
-        if SCREEN_HEIGHT*Multiplier(0.8*game.board_width/game.board_height) < SCREEN_WIDTH:
-            img = pygame.transform.scale(game.surf, (SCREEN_HEIGHT*Multiplier(0.8*game.board_width/game.board_height), SCREEN_HEIGHT*Multiplier(0.8)))
+                game.set_cell(x, y, 0)
+                board_dirty = True
+
+        frame_timer.current['events'] += time.perf_counter() - frame_start
+
+        if playing and not was_playing:
+            scheduler.start()
+        was_playing = playing
+        if playing and threaded:
+            if simulation is None:
+                simulation = SimulationThread(game.board, scheduler, game.cycles, pause_on_cycle)
+                published = game.board
+                simulation.start()
+        elif playing:
+            repeated = game.cycles is not None and game.cycles.found
+            with frame_timer.phase('step'):
+                generations = scheduler.advance(game, pause_on_cycle)
+            frame_timer.stepped_generations(generations)
+            board_dirty = board_dirty or generations > 0
+            if pause_on_cycle and game.cycles is not None and game.cycles.found and not repeated:
+                playing = False
+
+        if AUTOSAVE is not None:
+            with frame_timer.phase('autosave'):
+                AUTOSAVE.offer(game)
+
+        if show_timings and time.perf_counter() - overlay_drawn > OVERLAY_INTERVAL:
+            board_dirty = True  # the overlay sits on the board, so the board is drawn again under the new numbers
+
+        if game.board.rule != shown_rule:
+            shown_rule = RULE = game.board.rule  # a new board size keeps the rule that was loaded or picked
+            pygame.display.set_caption(f"game of life in python ({shown_rule})")
+
+        hovered = button_at(buttons, pos)
+        layout = (SCREEN_WIDTH, SCREEN_HEIGHT, game.board_width, game.board_height)
+        if layout != drawn_layout:
+            # the window or the board size changed, so everything is worked out and drawn again
+            buttons = toolbar_rects()
+            game_rect = board_rect(game)
+            camera.fit(game, game_rect)
+            surf.fill(GREY3)
+            drawn_layout, drawn_toolbar, board_dirty = layout, None, True
+            dirty_rects = [surf.get_rect()]
         else:
-            img = pygame.transform.scale(game.surf, (SCREEN_WIDTH*Multiplier(0.95), SCREEN_WIDTH*Multiplier(0.95*game.board_height/game.board_width)))
-        game_rect = img.get_rect()
-        game_rect.center = (SCREEN_WIDTH//2, SCREEN_HEIGHT*Multiplier(0.57))
-        surf.blit(img, game_rect)
-
-        for i in range(1, game.board_width):
-            pygame.draw.line(surf, GREY2, (game_rect.left + i * game_rect.width/game.board_width, game_rect.top),
-                             (game_rect.x + i * game_rect.width/game.board_width, game_rect.bottom))
-
-        for i in range(1, game.board_height):
-            pygame.draw.line(surf, GREY2, (game_rect.left, game_rect.top + i * game_rect.height/game.board_height),
-                             (game_rect.right, game_rect.top + i * game_rect.height/game.board_height))
-
-        pygame.draw.line(surf, GREY1, (0, SCREEN_HEIGHT*0.148), (SCREEN_WIDTH, SCREEN_HEIGHT*0.148))
-
-        play_rect = pygame.Rect((40*RATIO, 20*RATIO, 100*RATIO, 50*RATIO))
-        pygame.draw.rect(surf, GREY0, play_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if play_rect.collidepoint(pos) else GREY2, play_rect)
-        text = SETTINGS_FONT.render("pause" if playing else "play", False, BLACK)
-        r = text.get_rect()
-        r.center = (0, 45*RATIO)
-        r.left = 48*RATIO
-        surf.blit(text, r)
-
-        step_rect = pygame.Rect((40*RATIO, 80*RATIO, 100*RATIO, 30*RATIO))
-        pygame.draw.rect(surf, GREY0, step_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if step_rect.collidepoint(pos) else GREY2, step_rect)
-        text = SETTINGS_FONT.render("play step", False, BLACK)
-        r = text.get_rect()
-        r.center = (0*RATIO, 95*RATIO)
-        r.left = 48*RATIO
-        surf.blit(text, r)
-
-        clear_rect = pygame.Rect((165*RATIO, 20*RATIO, 75*RATIO, 90*RATIO))
-        pygame.draw.rect(surf, GREY0, clear_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if clear_rect.collidepoint(pos) else GREY2, clear_rect)
-        text = SETTINGS_FONT.render("clear", False, BLACK)
-        r = text.get_rect()
-        r.center = (200*RATIO, 65*RATIO)
-        surf.blit(text, r)
-
-        pygame.draw.line(surf, GREY1, (278*RATIO, 0*RATIO), (278*RATIO, 133*RATIO))
-
-        back_rect = pygame.Rect((315*RATIO, 20*RATIO, 100*RATIO, 40*RATIO))
-        pygame.draw.rect(surf, GREY0, back_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if back_rect.collidepoint(pos) else GREY2, back_rect)
-        text = SETTINGS_FONT.render("back", False, BLACK)
-        r = text.get_rect()
-        r.center = back_rect.center
-        r.left = 325*RATIO
-        surf.blit(text, r)
-
-        for_rect = pygame.Rect((315*RATIO, 70*RATIO, 100*RATIO, 40*RATIO))
-        pygame.draw.rect(surf, GREY0, for_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if for_rect.collidepoint(*pos) else GREY2, for_rect)
-        text = SETTINGS_FONT.render("forward", False, BLACK)
-        r = text.get_rect()
-        r.center = for_rect.center
-        r.left = 325*RATIO
-        surf.blit(text, r)
-
-        pygame.draw.line(surf, GREY1, (453*RATIO, 0*RATIO), (453*RATIO, 133*RATIO))
-
-        slow_rect = pygame.Rect((491*RATIO, 20*RATIO, 100*RATIO, 40*RATIO))
-        pygame.draw.rect(surf, GREY0, slow_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if slow_rect.collidepoint(pos) else GREY2, slow_rect)
-        text = SETTINGS_FONT.render("- speed", False, BLACK)
-        r = text.get_rect()
-        r.center = slow_rect.center
-        surf.blit(text, r)
-
-        speed_rect = pygame.Rect((491*RATIO, 70*RATIO, 100*RATIO, 40*RATIO))
-        pygame.draw.rect(surf, GREY0, speed_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if speed_rect.collidepoint(pos) else GREY2, speed_rect)
-        text = SETTINGS_FONT.render("+ speed", False, BLACK)
-        r = text.get_rect()
-        r.center = speed_rect.center
-        surf.blit(text, r)
-
-        pygame.draw.line(surf, GREY1, (629*RATIO, 0*RATIO), (629*RATIO, 133*RATIO))
-
-        size_rect = pygame.Rect((667*RATIO, 20*RATIO, 100*RATIO, 90*RATIO))
-        pygame.draw.rect(surf, GREY0, size_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if size_rect.collidepoint(pos) else GREY2, size_rect)
-        text = SETTINGS_FONT.render("change", False, BLACK)
-        r = text.get_rect()
-        r.center = (717*RATIO, 55*RATIO)
-        surf.blit(text, r)
-        text = SETTINGS_FONT.render("board size", False, BLACK)
-        r = text.get_rect()
-        r.center = (717*RATIO, 75*RATIO)
-        surf.blit(text, r)
-
-        pygame.draw.line(surf, GREY1, (805*RATIO, 0*RATIO), (805*RATIO, 133*RATIO))
-
-        pygame.draw.line(surf, GREY1, (1187*RATIO, 0*RATIO), (1187*RATIO, 133*RATIO))
-
-        save_as_rect = pygame.Rect((1225*RATIO, 20*RATIO, 75*RATIO, 90*RATIO))
-        pygame.draw.rect(surf, GREY0, save_as_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if save_as_rect.collidepoint(*pos) else GREY2, save_as_rect)
-        text = SETTINGS_FONT.render("save as", False, BLACK)
-        r = text.get_rect()
-        r.center = (1263*RATIO, 65*RATIO)
-        surf.blit(text, r)
-
-        load_rect = pygame.Rect((1325*RATIO, 20*RATIO, 75*RATIO, 90*RATIO))
-        pygame.draw.rect(surf, GREY0, load_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if load_rect.collidepoint(*pos) else GREY2, load_rect)
-        text = SETTINGS_FONT.render("load", False, BLACK)
-        r = text.get_rect()
-        r.center = (1363*RATIO, 65*RATIO)
-        surf.blit(text, r)
-
-        pygame.draw.line(surf, GREY1, (1438*RATIO, 0), (1438*RATIO, SCREEN_HEIGHT * 0.148))
-
-        quit_rect = pygame.Rect((1475*RATIO, 20*RATIO, 75*RATIO, 90*RATIO))
-        pygame.draw.rect(surf, GREY0, quit_rect, 5)
-        pygame.draw.rect(surf, GREY2_5 if quit_rect.collidepoint(*pos) else GREY2, quit_rect)
-        text = SETTINGS_FONT.render("quit", False, BLACK)
-        r = text.get_rect()
-        r.center = (1512*RATIO, 65*RATIO)
-        surf.blit(text, r)
-
-        pygame.display.update()
+            dirty_rects = []
+
+        if board_dirty or game is not drawn_game:
+            x0, y0, x1, y1 = camera.visible(game, game_rect.size)
+            if overlay in HEATMAPS and camera.zoom >= 1 and x0 < x1 and y0 < y1:  # heatmaps aren't drawn zoomed out
+                with frame_timer.phase('heatmap'):
+                    heatmap.follow(game.board, frame_timer.stepped, x0, y0, x1 - x0, y1 - y0)
+            view = draw_view(game, camera, game_rect.size, overlay, heatmap, frame_timer)  # times its own phases
+            with frame_timer.phase('draw'):
+                surf.blit(view, game_rect)
+            if show_timings:
+                with frame_timer.phase('overlay'):
+                    surf.blit(draw_overlay(frame_timer, game.board.population()), game_rect.topleft)
+                overlay_drawn = time.perf_counter()
+            dirty_rects.append(game_rect.inflate(2, 2))
+            board_dirty, drawn_game = False, game
+
+        toolbar_state = (hovered, playing, jump_power)
+        if toolbar_state != drawn_toolbar:
+            with frame_timer.phase('toolbar'):
+                toolbar = draw_toolbar(SCREEN_WIDTH, SCREEN_HEIGHT, *toolbar_state)
+                surf.blit(toolbar, (0, 0))
+            dirty_rects.append(toolbar.get_rect())
+            drawn_toolbar = toolbar_state
+
+        if dirty_rects:
+            with frame_timer.phase('display'):
+                pygame.display.update(dirty_rects)
+            if not startup.reported:
+                startup.report()
+        frame_timer.end_frame(log=show_timings or log_timings)
 
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.NOTSET, format="[%(levelname)s] -> %(message)s")
     logging.info("running version " + __version__)
+    if sys.argv[1:2] in (['run'], ['convert']):
+        # golly.py run pattern.brd --generations 1000 --out final.brd, without starting the ui
+        sys.exit(cli())
     try:
         main()
     except Exception:
         logging.info("an error has occurred")
         __tb = traceback.format_exc()
         logging.info(__tb)
-        __top = tkinter.Tk()
-        __top.withdraw()
-        showerror("Error", f"an error has occurred\ncrash report sent to {os.getcwd()}")
-        __top.destroy()
+        __saved = None
+        if AUTOSAVE is not None:
+            # the board is written before anything else, so the run can be picked up again with golly.py <file>
+            try:
+                __saved = AUTOSAVE.flush()
+            except Exception:
+                logging.info("could not save the board\n" + traceback.format_exc())
+        if __saved is not None:
+            logging.info(f"board saved to {__saved}")
         with open('crash report.txt', 'w') as __file:
             __file.write("an error has occurred\nplease send the contents of this file to https://github.com/TFC-343/GameOfLife/issues\n\n")
+            if __saved is not None:
+                __file.write(f"the board was saved to {os.path.abspath(__saved)}\n\n")
             __file.write(__tb)
+        show_error(f"an error has occurred\ncrash report sent to {os.getcwd()}"
+                   + ("" if __saved is None else f"\nthe board was saved to {__saved}"))
     except KeyboardInterrupt:
         logging.info("closing from user interrupt")
     else:
         logging.info("closing")
     finally:
+        if RECORDER is not None:
+            stop_recording()
+        if AUTOSAVE is not None:
+            AUTOSAVE.stop()
+        if TK_ROOT is not None:
+            TK_ROOT.destroy()
         pygame.quit()
         sys.exit()
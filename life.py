@@ -0,0 +1,1941 @@
+#!/usr/bin/env python3.9
+
+"""
+the simulation side of the game of life, the boards, the engines that step them and pattern files
+
+nothing in here needs pygame or a display, so it can be run headless with
+    python life.py run pattern.brd --generations 1000 --out final.brd
+    python life.py census --soups 10000 --table census.json
+    python life.py run pattern.brd --generations 1000 --record run.png
+"""
+
+__author__ = "TFC343"
+
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import itertools
+import json
+import logging
+import os
+import queue
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+
+class DimensionError(Exception):
+    pass
+
+
+class AbyssList(list):
+    def __getitem__(self, item):
+        if 0 <= item < len(self):
+            return list.__getitem__(self, item)
+        else:
+            return VoidEntity()
+
+    def __setitem__(self, key, value):
+        if 0 <= key < len(self):
+            list.__setitem__(self, key, value)
+        else:
+            pass
+
+
+class TorusList(list):
+    def __getitem__(self, item):
+        item = item % len(self)
+        return list.__getitem__(self, item)
+
+    def __setitem__(self, key, value):
+        key = key % len(self)
+        list.__setitem__(self, key, value)
+
+
+class PlaneList(list):
+    """an unbounded plane, the board goes on forever in every direction so only ChunkBoard can hold it"""
+
+
+ListType = TorusList  # the type of list being used for the board
+
+
+class VoidEntity:
+    def __init__(self):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return VoidEntity()
+
+    def __getattribute__(self, item):
+        return VoidEntity()
+
+    def __setattr__(self, key, value):
+        pass
+
+    def __getitem__(self, item):
+        return VoidEntity()
+
+    def __setitem__(self, key, value):
+        pass
+
+    def __eq__(self, other):
+        return False
+
+    def __ne__(self, other):
+        return False
+
+    def __lt__(self, other):
+        return False
+
+
+NEIGHBOURS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+class Rule:
+    """an outer totalistic rule like B3/S23, the neighbour counts that bring a dead cell to life and keep a live one alive
+
+    it is compiled into a 2x9 table of the next state, indexed by [state, live neighbours]
+    """
+    def __init__(self, birth, survive):
+        self.birth, self.survive = frozenset(birth), frozenset(survive)
+        if not self.birth | self.survive <= set(range(9)):
+            raise ValueError("neighbour counts go from 0 to 8")
+        self.table = np.zeros((2, 9), np.uint8)
+        self.table[0, list(self.birth)] = 1
+        self.table[1, list(self.survive)] = 1
+        self.lookup = self.table.ravel()  # the table flattened for state * 9 + neighbours
+
+    @classmethod
+    def parse(cls, text):
+        """reads a rulestring, B3/S23 or S23/B3 in any case, the old 23/3 survive/birth form, or a name from RULES"""
+        text = RULES.get(text.strip().lower(), text).strip().upper()
+        match = re.fullmatch(r'B(\d*)/S(\d*)|S(\d*)/B(\d*)|(\d*)/(\d*)', text)
+        if match is None:
+            raise ValueError(f"{text} is not a rulestring")
+        if match[1] is not None:
+            birth, survive = match[1], match[2]
+        elif match[3] is not None:
+            survive, birth = match[3], match[4]
+        else:
+            survive, birth = match[5], match[6]
+        return cls(map(int, birth), map(int, survive))
+
+    @property
+    def conway(self):
+        return self == CONWAY
+
+    def __eq__(self, other):
+        return isinstance(other, Rule) and (self.birth, self.survive) == (other.birth, other.survive)
+
+    def __hash__(self):
+        return hash((self.birth, self.survive))
+
+    def __str__(self):
+        return f"B{''.join(map(str, sorted(self.birth)))}/S{''.join(map(str, sorted(self.survive)))}"
+
+    def __repr__(self):
+        return f"Rule.parse({str(self)!r})"
+
+
+RULES = {  # some well known rules that can be asked for by name
+    'life': 'B3/S23',
+    'highlife': 'B36/S23',
+    'seeds': 'B2/S',
+    'daynight': 'B3678/S34678',
+    'lifewithoutdeath': 'B3/S012345678',
+    '2x2': 'B36/S125',
+    'replicator': 'B1357/S1357',
+    'diamoeba': 'B35678/S5678',
+    'morley': 'B368/S245',
+    'maze': 'B3/S12345',
+}
+CONWAY = Rule({3}, {2, 3})
+
+
+class Column:
+    """a single column of a board, so cells can be reached with board[x][y]"""
+    __slots__ = ('board', 'x')
+
+    def __init__(self, board, x):
+        self.board = board
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.board.get(self.x, y)
+
+    def __setitem__(self, y, value):
+        self.board.set(self.x, y, value)
+
+    def __len__(self):
+        return self.board.height
+
+    def __iter__(self):
+        return iter(self.board.column(self.x))
+
+
+def crop(cells, x0, y0, width, height):
+    """a rectangle cut out of a cell array, with dead cells where it goes past the edges"""
+    region = np.zeros((width, height), cells.dtype)
+    x_start, x_end = max(x0, 0), min(x0 + width, cells.shape[0])
+    y_start, y_end = max(y0, 0), min(y0 + height, cells.shape[1])
+    if x_start < x_end and y_start < y_end:
+        region[x_start - x0:x_end - x0, y_start - y0:y_end - y0] = cells[x_start:x_end, y_start:y_end]
+    return region
+
+
+class Board:
+    """base class for the board engines, indexed like the old ListType boards with board[x][y]
+
+    subclasses store the cells however they like and implement get, set, step, to_array and from_array
+    """
+    def __init__(self, width, height, topology=None, rule=None):
+        self.width, self.height = width, height
+        self.topology = ListType if topology is None else topology  # TorusList wraps, AbyssList has a hard edge
+        self.rule = CONWAY if rule is None else rule
+
+    @property
+    def torus(self):
+        return self.topology is TorusList
+
+    def wrap(self, x, y):
+        """returns the real position of (x, y) on the board, or None if it is off the edge"""
+        if self.torus:
+            return x % self.width, y % self.height
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return x, y
+        return None
+
+    def __getitem__(self, x):
+        if not self.torus and not 0 <= x < self.width:
+            return VoidEntity()
+        return Column(self, x)
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return (Column(self, x) for x in range(self.width))
+
+    def column(self, x):
+        """all the values in a column as a list"""
+        return [self.get(x, y) for y in range(self.height)]
+
+    def get(self, x, y):
+        raise NotImplementedError
+
+    def set(self, x, y, value):
+        raise NotImplementedError
+
+    def step(self):
+        """returns a new board one generation on"""
+        raise NotImplementedError
+
+    def to_array(self):
+        """the board as a (width, height) uint8 numpy array"""
+        raise NotImplementedError
+
+    @classmethod
+    def from_array(cls, cells, topology=None, rule=None):
+        raise NotImplementedError
+
+    def to_packed(self):
+        """the board as a (width, ceil(height / 8)) uint8 array, each column's bits packed in little endian bit order"""
+        return np.packbits(self.to_array(), axis=1, bitorder='little')
+
+    @classmethod
+    def from_packed(cls, packed, height, topology=None, rule=None):
+        return cls.from_array(np.unpackbits(packed, axis=1, count=height, bitorder='little'), topology, rule)
+
+    def live_cells(self):
+        """the (x, y) position of every live cell"""
+        return zip(*np.nonzero(self.to_array()))
+
+    def live_positions(self):
+        """the (xs, ys) arrays of every live cell"""
+        return np.nonzero(self.to_array())
+
+    def region(self, x0, y0, width, height):
+        """the cells of any rectangle as an array, anything off the board is dead"""
+        return crop(self.to_array(), x0, y0, width, height)
+
+    def neighbour_counts(self, x0, y0, width, height):
+        """the live neighbours of every cell in a rectangle, counted the same way as when stepping"""
+        return neighbour_window(self.to_array(), self.torus, x0, y0, width, height)
+
+    def snapshot(self):
+        """the cells as an array and a layout that from_snapshot needs to put them back, the layout can be compared"""
+        return self.to_array(), (self.width, self.height, self.topology, self.rule)
+
+    @classmethod
+    def from_snapshot(cls, cells, layout):
+        width, height, topology, rule = layout
+        return cls.from_array(cells, topology, rule)
+
+    def population(self):
+        """how many cells are alive"""
+        return int(np.count_nonzero(self.to_array()))
+
+    def flipped(self, old):
+        """the (xs, ys) arrays of the cells that differ from an older board of the same size"""
+        return np.nonzero(self.to_array() != old.to_array())
+
+
+WORKERS = 1  # how many threads step an array board
+PARALLEL_MIN_CELLS = 512 * 512  # smaller boards aren't worth splitting up
+_pool = None
+
+
+def sum_neighbours(padded):
+    """counts the live neighbours of every cell of an array with a one cell border, using shifted slices"""
+    width, height = padded.shape[0] - 2, padded.shape[1] - 2
+    total = np.zeros((width, height), np.uint8)
+    for d0, d1 in NEIGHBOURS:
+        total += padded[1+d0:1+d0+width, 1+d1:1+d1+height]
+    return total
+
+
+def count_neighbours(cells, torus):
+    """counts the live neighbours of every cell in one pass"""
+    return sum_neighbours(np.pad(cells, 1, mode='wrap' if torus else 'constant'))
+
+
+def neighbour_window(cells, torus, x0, y0, width, height):
+    """count_neighbours for just a rectangle of the cells, only it and a one cell border round it are looked at"""
+    if torus:
+        xs = np.arange(x0 - 1, x0 + width + 1) % cells.shape[0]
+        ys = np.arange(y0 - 1, y0 + height + 1) % cells.shape[1]
+        return sum_neighbours(cells[np.ix_(xs, ys)])
+    return sum_neighbours(crop(cells, x0 - 1, y0 - 1, width + 2, height + 2))
+
+
+def apply_rule(cells, surrounding, rule=CONWAY):
+    """a rule for every cell at once, looked up in its table
+
+    conway's rule is left as two comparisons, which numpy does faster than the lookup
+    """
+    if rule.conway:
+        return ((surrounding == 3) | ((surrounding == 2) & (cells == 1))).view(np.uint8)
+    return rule.lookup[cells * 9 + surrounding]
+
+
+def next_generation(cells, torus, rule=CONWAY):
+    """the next generation of a uint8 cell array"""
+    if WORKERS > 1 and cells.size >= PARALLEL_MIN_CELLS:
+        return parallel_next_generation(cells, torus, rule)
+    return apply_rule(cells, count_neighbours(cells, torus), rule)
+
+
+def set_workers(workers):
+    global WORKERS, _pool
+    WORKERS = max(1, workers)
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = concurrent.futures.ThreadPoolExecutor(WORKERS) if WORKERS > 1 else None
+
+
+def parallel_next_generation(cells, torus, rule=CONWAY):
+    """steps the board as horizontal strips on the thread pool, numpy lets go of the GIL while it adds
+
+    each strip gets a halo row above and below, taken from the other side on a torus and empty on the abyss
+    """
+    mode = 'wrap' if torus else 'constant'
+    height = cells.shape[1]
+    rows = np.pad(cells, ((0, 0), (1, 1)), mode=mode)
+    new_cells = np.empty_like(cells)
+
+    def step_strip(top, bottom):
+        strip = np.pad(rows[:, top:bottom + 2], ((1, 1), (0, 0)), mode=mode)
+        new_cells[:, top:bottom] = apply_rule(cells[:, top:bottom], sum_neighbours(strip), rule)
+
+    bounds = sorted(set(np.linspace(0, height, WORKERS + 1).astype(int).tolist()))
+    for future in [_pool.submit(step_strip, top, bottom) for top, bottom in zip(bounds, bounds[1:])]:
+        future.result()
+    return new_cells
+
+
+TILE = 8  # the size of the blocks that changes are tracked in
+ACTIVE_LIMIT = 0.25  # once more than this fraction of the tiles are active it's quicker to do everything
+_serials = itertools.count()
+
+
+def changed_tiles(old, new):
+    """which tiles have any cell that differs between two cell arrays"""
+    width, height = old.shape
+    tiles_x, tiles_y = -(-width // TILE), -(-height // TILE)
+    diff = np.zeros((tiles_x * TILE, tiles_y * TILE), bool)
+    diff[:width, :height] = old != new
+    return diff.reshape(tiles_x, TILE, tiles_y, TILE).any(axis=(1, 3))
+
+
+def step_tiles(cells, torus, active, rule=CONWAY):
+    """steps only the active tiles of a cell array, everything else is copied over as it is
+
+    returns the new cells and which tiles changed
+    """
+    width, height = cells.shape
+    tiles_x, tiles_y = active.shape
+    tx, ty = np.nonzero(active)
+    block = np.arange(TILE + 2) - 1  # a tile and its halo
+    xs, ys = tx[:, None] * TILE + block, ty[:, None] * TILE + block
+    if torus:
+        source, new_cells = cells, cells.copy()
+        xs, ys = xs % width, ys % height
+        xs_out, ys_out = xs[:, 1:-1], ys[:, 1:-1]  # the last tiles wrap round onto the first, which is harmless
+    else:
+        # put the board in an empty frame that is a whole number of tiles across with a halo round it
+        source = np.zeros((tiles_x * TILE + 2, tiles_y * TILE + 2), np.uint8)
+        source[1:width + 1, 1:height + 1] = cells
+        new_cells = source.copy()
+        xs, ys = xs + 1, ys + 1
+        xs_out, ys_out = xs[:, 1:-1], ys[:, 1:-1]
+
+    blocks = source[xs[:, :, None], ys[:, None, :]]
+    surrounding = np.zeros((len(tx), TILE, TILE), np.uint8)
+    for d0, d1 in NEIGHBOURS:
+        surrounding += blocks[:, 1+d0:1+d0+TILE, 1+d1:1+d1+TILE]
+    old = blocks[:, 1:-1, 1:-1]
+    new = apply_rule(old, surrounding, rule)
+    if not torus:
+        # cells past the edge of the abyss stay dead
+        new &= ((xs_out <= width)[:, :, None] & (ys_out <= height)[:, None, :]).view(np.uint8)
+    new_cells[xs_out[:, :, None], ys_out[:, None, :]] = new
+
+    changed = np.zeros(active.shape, bool)
+    changed[tx, ty] = (new != old).any(axis=(1, 2))
+    if not torus:
+        new_cells = np.ascontiguousarray(new_cells[1:width + 1, 1:height + 1])
+    return new_cells, changed
+
+
+class ArrayBoard(Board):
+    """a board stored as a numpy uint8 array and stepped with vectorised neighbour sums
+
+    it remembers which tiles changed in the last generation (or were drawn on), and the next step only works out
+    those tiles and the ones next to them, as nothing else can change
+    """
+    def __init__(self, width, height, topology=None, cells=None, changed=None, previous=None, rule=None):
+        super().__init__(width, height, topology, rule)
+        self.cells = np.zeros((width, height), np.uint8) if cells is None else cells
+        self.changed = changed  # tiles that changed since the last generation, None if it isn't known
+        self.previous = previous  # the serial of the board this one was stepped from
+        self.edited = None  # tiles set by hand, passed on as changed to the next board so they get drawn again
+        self.serial = next(_serials)
+
+    def get(self, x, y):
+        pos = self.wrap(x, y)
+        if pos is None:
+            return VoidEntity()
+        return int(self.cells[pos])
+
+    def set(self, x, y, value):
+        pos = self.wrap(x, y)
+        if pos is not None:
+            self.cells[pos] = value
+            if self.changed is not None:
+                self.changed[pos[0] // TILE, pos[1] // TILE] = True
+            if self.edited is None:
+                self.edited = np.zeros((-(-self.width // TILE), -(-self.height // TILE)), bool)
+            self.edited[pos[0] // TILE, pos[1] // TILE] = True
+
+    def column(self, x):
+        return self.cells[x].tolist()
+
+    def step(self):
+        if self.changed is None:
+            active = None
+        else:
+            active = sum_neighbours(np.pad(self.changed, 1, mode='wrap' if self.torus else 'constant')) > 0
+            active |= self.changed
+        if active is None or active.mean() > ACTIVE_LIMIT:
+            cells = next_generation(self.cells, self.torus, self.rule)
+            changed = changed_tiles(self.cells, cells)
+        elif not active.any():
+            cells, changed = self.cells.copy(), active
+        else:
+            cells, changed = step_tiles(self.cells, self.torus, active, self.rule)
+        if self.edited is not None:
+            changed = changed | self.edited
+        return ArrayBoard(self.width, self.height, self.topology, cells, changed, self.serial, self.rule)
+
+    def to_array(self):
+        return self.cells.copy()
+
+    def population(self):
+        return int(np.count_nonzero(self.cells))
+
+    def region(self, x0, y0, width, height):
+        return crop(self.cells, x0, y0, width, height)
+
+    def neighbour_counts(self, x0, y0, width, height):
+        return neighbour_window(self.cells, self.torus, x0, y0, width, height)
+
+    def flipped(self, old):
+        """only looks in the tiles that changed when this board was stepped straight from old"""
+        if self.changed is None or self.previous != getattr(old, 'serial', None):
+            return super().flipped(old)
+        tx, ty = np.nonzero(self.changed)
+        if len(tx) > ACTIVE_LIMIT * self.changed.size:
+            return np.nonzero(self.cells != old.cells)
+        block = np.arange(TILE)
+        xs, ys = tx[:, None] * TILE + block, ty[:, None] * TILE + block
+        inside = (xs < self.width)[:, :, None] & (ys < self.height)[:, None, :]  # tiles on the far edges can be cut short
+        xs, ys = np.minimum(xs, self.width - 1), np.minimum(ys, self.height - 1)
+        diff = (self.cells[xs[:, :, None], ys[:, None, :]] != old.cells[xs[:, :, None], ys[:, None, :]]) & inside
+        tiles, i, j = np.nonzero(diff)
+        return xs[tiles, i], ys[tiles, j]
+
+    @classmethod
+    def from_array(cls, cells, topology=None, rule=None):
+        """uses the array as it is when it is already a contiguous uint8 array, so don't hold on to it"""
+        width, height = cells.shape
+        return cls(width, height, topology, np.ascontiguousarray(cells, np.uint8), rule=rule)
+
+
+class SparseBoard(Board):
+    """a board that only stores the positions of live cells, so a step costs time in the population not the area"""
+    def __init__(self, width, height, topology=None, live=None, rule=None):
+        super().__init__(width, height, topology, rule)
+        self.live = set() if live is None else live
+
+    def get(self, x, y):
+        pos = self.wrap(x, y)
+        if pos is None:
+            return VoidEntity()
+        return int(pos in self.live)
+
+    def set(self, x, y, value):
+        pos = self.wrap(x, y)
+        if pos is None:
+            return
+        if value == 1:
+            self.live.add(pos)
+        else:
+            self.live.discard(pos)
+
+    def step(self):
+        width, height, rule = self.width, self.height, self.rule
+        if 0 in rule.birth:
+            # every empty space comes to life, which a set of live cells can't do cheaply
+            return SparseBoard.from_array(next_generation(self.to_array(), self.torus, rule), self.topology, rule)
+        if self.torus:
+            surrounding = collections.Counter(((x + d0) % width, (y + d1) % height)
+                                              for x, y in self.live for d0, d1 in NEIGHBOURS)
+        else:
+            surrounding = collections.Counter((x + d0, y + d1) for x, y in self.live for d0, d1 in NEIGHBOURS)
+        live = self.live
+        if rule.conway:
+            new_live = {pos for pos, count in surrounding.items() if count == 3 or (count == 2 and pos in live)}
+        else:
+            birth, survive = rule.birth, rule.survive
+            new_live = {pos for pos, count in surrounding.items() if count in (survive if pos in live else birth)}
+            if 0 in survive:
+                new_live |= live - surrounding.keys()  # live cells with no neighbours never got counted
+        if not self.torus:
+            new_live = {(x, y) for x, y in new_live if 0 <= x < width and 0 <= y < height}
+        return SparseBoard(width, height, self.topology, new_live, rule)
+
+    def to_array(self):
+        cells = np.zeros((self.width, self.height), np.uint8)
+        if self.live:
+            cells[tuple(np.array(list(self.live)).T)] = 1
+        return cells
+
+    @classmethod
+    def from_array(cls, cells, topology=None, rule=None):
+        width, height = cells.shape
+        return cls(width, height, topology, set(zip(*(a.tolist() for a in np.nonzero(cells)))), rule)
+
+    def live_cells(self):
+        return iter(self.live)
+
+    def region(self, x0, y0, width, height):
+        cells = np.zeros((width, height), np.uint8)
+        inside = [(x - x0, y - y0) for x, y in self.live if x0 <= x < x0 + width and y0 <= y < y0 + height]
+        if inside:
+            cells[tuple(np.array(inside).T)] = 1
+        return cells
+
+    def population(self):
+        return len(self.live)
+
+    def flipped(self, old):
+        diff = self.live ^ old.live
+        if not diff:
+            return np.zeros(0, np.intp), np.zeros(0, np.intp)
+        return tuple(np.array(list(diff)).T)
+
+
+class PackedBoard(Board):
+    """a board with each column packed into the bits of a python int, bit y being the cell at y
+
+    a generation is worked out for a whole column at once by adding the eight neighbour columns with bitwise adders
+    """
+    def __init__(self, width, height, topology=None, columns=None, rule=None):
+        super().__init__(width, height, topology, rule)
+        self.columns = [0] * width if columns is None else columns
+
+    def get(self, x, y):
+        pos = self.wrap(x, y)
+        if pos is None:
+            return VoidEntity()
+        x, y = pos
+        return self.columns[x] >> y & 1
+
+    def set(self, x, y, value):
+        pos = self.wrap(x, y)
+        if pos is None:
+            return
+        x, y = pos
+        if value == 1:
+            self.columns[x] |= 1 << y
+        else:
+            self.columns[x] &= ~(1 << y)
+
+    def column(self, x):
+        column = self.columns[x]
+        return [column >> y & 1 for y in range(self.height)]
+
+    def step(self):
+        width, height, rule = self.width, self.height, self.rule
+        mask = (1 << height) - 1
+        columns = self.columns
+        # for other rules each count from 0 to 8 a column can match, as which of its count bits must be set
+        counts = [(n in rule.birth, n in rule.survive, n & 1, n & 2, n & 4, n & 8) for n in range(9)]
+        counts = [count for count in counts if count[0] or count[1]]
+        if self.torus:
+            ups = [(c << 1 | c >> (height - 1)) & mask for c in columns]  # bit y holds the cell at y - 1
+            downs = [c >> 1 | (c & 1) << (height - 1) for c in columns]  # bit y holds the cell at y + 1
+        else:
+            # an extra empty column past the edge, which index -1 and width both land on
+            ups = [c << 1 & mask for c in columns] + [0]
+            downs = [c >> 1 for c in columns] + [0]
+            columns = columns + [0]
+        new_columns = []
+        for x in range(width):
+            right = (x + 1) % len(columns)
+            # the eight neighbours added as 3 + 3 + 2 with full and half adders
+            a, b, c = ups[x - 1], columns[x - 1], downs[x - 1]
+            ones_0, twos_0 = a ^ b ^ c, (a & b) | (c & (a ^ b))
+            a, b, c = ups[right], columns[right], downs[right]
+            ones_1, twos_1 = a ^ b ^ c, (a & b) | (c & (a ^ b))
+            a, b = ups[x], downs[x]
+            ones_2, twos_2 = a ^ b, a & b
+            a, b, c = ones_0, ones_1, ones_2
+            ones, twos_3 = a ^ b ^ c, (a & b) | (c & (a ^ b))
+            a, b, c = twos_0, twos_1, twos_2
+            twos, fours_0 = a ^ b ^ c, (a & b) | (c & (a ^ b))
+            twos, fours_1 = twos ^ twos_3, twos & twos_3
+            fours = fours_0 ^ fours_1
+            if rule.conway:
+                # a count of 2 or 3 (a count of 8 wraps round to 0, which is dead anyway)
+                new_columns.append(twos & ~fours & (ones | columns[x]))
+                continue
+            eights = fours_0 & fours_1
+            born = survived = 0
+            for birth, survive, one, two, four, eight in counts:
+                match = (ones if one else ~ones) & (twos if two else ~twos) & (fours if four else ~fours) & (eights if eight else ~eights)
+                if birth:
+                    born |= match
+                if survive:
+                    survived |= match
+            new_columns.append((born & ~columns[x] | survived & columns[x]) & mask)
+        return PackedBoard(width, height, self.topology, new_columns, rule)
+
+    def to_array(self):
+        return np.unpackbits(self.to_packed(), axis=1, count=self.height, bitorder='little')
+
+    @classmethod
+    def from_array(cls, cells, topology=None, rule=None):
+        packed = np.packbits(np.asarray(cells, np.uint8), axis=1, bitorder='little')
+        return cls.from_packed(packed, cells.shape[1], topology, rule)
+
+    def to_packed(self):
+        size = (self.height + 7) // 8
+        data = b''.join(c.to_bytes(size, 'little') for c in self.columns)
+        return np.frombuffer(data, np.uint8).reshape(self.width, size)
+
+    def region(self, x0, y0, width, height):
+        """only the columns in the rectangle are unpacked, shifted down so the rectangle's top is bit 0"""
+        cells = np.zeros((width, height), np.uint8)
+        x_start, x_end = max(x0, 0), min(x0 + width, self.width)
+        y_start, y_end = max(y0, 0), min(y0 + height, self.height)
+        if x_start < x_end and y_start < y_end:
+            rows, mask = y_end - y_start, (1 << (y_end - y_start)) - 1
+            size = (rows + 7) // 8
+            data = b''.join((c >> y_start & mask).to_bytes(size, 'little') for c in self.columns[x_start:x_end])
+            packed = np.frombuffer(data, np.uint8).reshape(x_end - x_start, size)
+            cells[x_start - x0:x_end - x0, y_start - y0:y_end - y0] = np.unpackbits(packed, axis=1, count=rows, bitorder='little')
+        return cells
+
+    @classmethod
+    def from_packed(cls, packed, height, topology=None, rule=None):
+        """the packed columns turn straight into ints without unpacking"""
+        mask = (1 << height) - 1
+        return cls(len(packed), height, topology, [int.from_bytes(row.tobytes(), 'little') & mask for row in packed], rule)
+
+    def live_cells(self):
+        for x, column in enumerate(self.columns):
+            while column:
+                low = column & -column
+                yield x, low.bit_length() - 1
+                column ^= low
+
+    def population(self):
+        return sum(bin(column).count('1') for column in self.columns)
+
+    def flipped(self, old):
+        """the columns xor-ed together as ints, then unpacked all at once"""
+        diff = PackedBoard(self.width, self.height, self.topology, [a ^ b for a, b in zip(self.columns, old.columns)])
+        return np.nonzero(diff.to_array())
+
+
+CHUNK = 64  # the size of the square chunks an unbounded board is stored in
+
+
+class ChunkBoard(Board):
+    """a board on an unbounded plane, stored as CHUNK x CHUNK arrays in a dict keyed by chunk position
+
+    chunks are made when live cells reach them and dropped once they are empty, so memory follows the live cells
+    width and height are only the part of the plane that is shown, and live cells can be anywhere
+    """
+    def __init__(self, width, height, topology=None, chunks=None, rule=None):
+        super().__init__(width, height, PlaneList, rule)
+        if 0 in self.rule.birth:
+            raise ValueError("a rule with births on 0 neighbours would fill the whole plane")
+        self.chunks = {} if chunks is None else chunks
+
+    def __getitem__(self, x):
+        return Column(self, x)
+
+    def wrap(self, x, y):
+        return x, y
+
+    def get(self, x, y):
+        chunk = self.chunks.get((x // CHUNK, y // CHUNK))
+        return 0 if chunk is None else int(chunk[x % CHUNK, y % CHUNK])
+
+    def set(self, x, y, value):
+        key = x // CHUNK, y // CHUNK
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if value != 1:
+                return
+            chunk = self.chunks[key] = np.zeros((CHUNK, CHUNK), np.uint8)
+        chunk[x % CHUNK, y % CHUNK] = value
+        if value != 1 and not chunk.any():
+            del self.chunks[key]
+
+    def step(self):
+        if not self.chunks:
+            return ChunkBoard(self.width, self.height, None, {}, self.rule)
+        keys = list(self.chunks)
+        # all the chunks in one array, after an empty one that stands in for chunks that aren't stored
+        stacked = np.concatenate([np.zeros((1, CHUNK, CHUNK), np.uint8), np.stack([self.chunks[key] for key in keys])])
+        live = stacked[1:]
+
+        # a chunk only needs working out if it has live cells or a neighbour has live cells on the edge next to it
+        targets = dict.fromkeys(keys)
+        for dx, dy, edge in ((-1, 0, live[:, 0].any(axis=1)), (1, 0, live[:, -1].any(axis=1)),
+                             (0, -1, live[:, :, 0].any(axis=1)), (0, 1, live[:, :, -1].any(axis=1)),
+                             (-1, -1, live[:, 0, 0]), (1, -1, live[:, -1, 0]), (-1, 1, live[:, 0, -1]), (1, 1, live[:, -1, -1])):
+            for i in np.flatnonzero(edge).tolist():
+                targets[keys[i][0] + dx, keys[i][1] + dy] = None
+        targets = list(targets)
+
+        # every target chunk with a one cell border taken from the chunks round it, stepped all at once
+        position = {key: i + 1 for i, key in enumerate(keys)}
+        around = np.array([[position.get((cx + dx, cy + dy), 0) for dx in (-1, 0, 1) for dy in (-1, 0, 1)] for cx, cy in targets])
+        padded = np.empty((len(targets), CHUNK + 2, CHUNK + 2), np.uint8)
+        parts = ((slice(-1, None), slice(0, 1)), (slice(None), slice(1, -1)), (slice(0, 1), slice(-1, None)))
+        for i, ((source_x, x_out), (source_y, y_out)) in enumerate(itertools.product(parts, parts)):
+            padded[:, x_out, y_out] = stacked[around[:, i], source_x, source_y]
+        surrounding = np.zeros((len(targets), CHUNK, CHUNK), np.uint8)
+        for d0, d1 in NEIGHBOURS:
+            surrounding += padded[:, 1+d0:1+d0+CHUNK, 1+d1:1+d1+CHUNK]
+        new = apply_rule(padded[:, 1:-1, 1:-1], surrounding, self.rule)
+        alive = new.any(axis=(1, 2))
+        new_chunks = {key: new[i].copy() for i, key in enumerate(targets) if alive[i]}
+        return ChunkBoard(self.width, self.height, None, new_chunks, self.rule)
+
+    def region(self, x0, y0, width, height):
+        """the cells of any rectangle of the plane as an array"""
+        cells = np.zeros((width, height), np.uint8)
+        for (cx, cy), chunk in self.chunks.items():
+            left, top = cx * CHUNK, cy * CHUNK
+            x_start, x_end = max(left, x0), min(left + CHUNK, x0 + width)
+            y_start, y_end = max(top, y0), min(top + CHUNK, y0 + height)
+            if x_start < x_end and y_start < y_end:
+                cells[x_start - x0:x_end - x0, y_start - y0:y_end - y0] = chunk[x_start - left:x_end - left, y_start - top:y_end - top]
+        return cells
+
+    def neighbour_counts(self, x0, y0, width, height):
+        return sum_neighbours(self.region(x0 - 1, y0 - 1, width + 2, height + 2))
+
+    def to_array(self):
+        """the part of the plane that is shown"""
+        return self.region(0, 0, self.width, self.height)
+
+    @classmethod
+    def from_array(cls, cells, topology=None, rule=None):
+        width, height = cells.shape
+        board = cls(width, height, None, {}, rule)
+        for cx in range(0, width, CHUNK):
+            for cy in range(0, height, CHUNK):
+                part = cells[cx:cx + CHUNK, cy:cy + CHUNK]
+                if part.any():
+                    chunk = board.chunks[cx // CHUNK, cy // CHUNK] = np.zeros((CHUNK, CHUNK), np.uint8)
+                    chunk[:part.shape[0], :part.shape[1]] = part
+        return board
+
+    def live_positions(self):
+        if not self.chunks:
+            return np.zeros(0, np.intp), np.zeros(0, np.intp)
+        keys = list(self.chunks)
+        index, xs, ys = np.nonzero(np.stack([self.chunks[key] for key in keys]))
+        origins = np.array(keys, np.intp) * CHUNK
+        return origins[index, 0] + xs, origins[index, 1] + ys
+
+    def live_cells(self):
+        return zip(*(a.tolist() for a in self.live_positions()))
+
+    def population(self):
+        return sum(int(np.count_nonzero(chunk)) for chunk in self.chunks.values())
+
+    def flipped(self, old):
+        xs, ys = [], []
+        empty = np.zeros((CHUNK, CHUNK), np.uint8)
+        for key in self.chunks.keys() | old.chunks.keys():
+            chunk_xs, chunk_ys = np.nonzero(self.chunks.get(key, empty) != old.chunks.get(key, empty))
+            xs.append(chunk_xs + key[0] * CHUNK)
+            ys.append(chunk_ys + key[1] * CHUNK)
+        if not xs:
+            return np.zeros(0, np.intp), np.zeros(0, np.intp)
+        return np.concatenate(xs), np.concatenate(ys)
+
+    def snapshot(self):
+        """the chunks stacked up, with their positions in the layout"""
+        keys = tuple(sorted(self.chunks))
+        cells = np.stack([self.chunks[key] for key in keys]) if keys else np.zeros((0, CHUNK, CHUNK), np.uint8)
+        return cells, (self.width, self.height, keys, self.rule)
+
+    @classmethod
+    def from_snapshot(cls, cells, layout):
+        width, height, keys, rule = layout
+        return cls(width, height, None, {key: cells[i].copy() for i, key in enumerate(keys)}, rule)
+
+    def extent(self):
+        """the smallest (x0, y0, x1, y1) rectangle holding the shown part of the plane and every live cell"""
+        xs, ys = self.live_positions()
+        if not len(xs):
+            return 0, 0, self.width, self.height
+        return min(0, int(xs.min())), min(0, int(ys.min())), max(self.width, int(xs.max()) + 1), max(self.height, int(ys.max()) + 1)
+
+    def bounded(self):
+        """a copy moved so the extent starts at 0, 0 and is all shown, for saving as a normal board"""
+        x0, y0, x1, y1 = self.extent()
+        return ChunkBoard.from_array(self.region(x0, y0, x1 - x0, y1 - y0), None, self.rule)
+
+
+ENGINES = {'array': ArrayBoard, 'sparse': SparseBoard, 'packed': PackedBoard}
+TOPOLOGIES = {'torus': TorusList, 'abyss': AbyssList, 'plane': PlaneList}  # the plane always uses a ChunkBoard
+
+
+HASHLIFE_CACHE_SIZE = 1 << 18  # the most quadtree nodes and results hashlife keeps around
+
+
+class Node:
+    """a hashlife quadtree node, level 0 nodes are single cells and a level n node is 2^n cells across"""
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, population=0):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.population = population
+
+
+OFF = Node(0)
+ON = Node(0, population=1)
+
+
+@functools.lru_cache(maxsize=HASHLIFE_CACHE_SIZE)
+def join_nodes(nw, ne, sw, se):
+    """the node made of four quadrants, cached so equal patterns share nodes"""
+    return Node(nw.level + 1, nw, ne, sw, se, nw.population + ne.population + sw.population + se.population)
+
+
+@functools.lru_cache(maxsize=None)
+def empty_node(level):
+    if level == 0:
+        return OFF
+    child = empty_node(level - 1)
+    return join_nodes(child, child, child, child)
+
+
+def centre_node(node):
+    """the middle half of a node"""
+    return join_nodes(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+
+def _life_4x4(node, rule):
+    """steps the middle 2x2 of a level 2 node by one generation"""
+    cells = [[0] * 4 for _ in range(4)]
+    for qx, qy, quad in ((0, 0, node.nw), (2, 0, node.ne), (0, 2, node.sw), (2, 2, node.se)):
+        for dx, dy, cell in ((0, 0, quad.nw), (1, 0, quad.ne), (0, 1, quad.sw), (1, 1, quad.se)):
+            cells[qx + dx][qy + dy] = cell.population
+    new = []
+    for x, y in ((1, 1), (2, 1), (1, 2), (2, 2)):
+        surrounding = sum(cells[x + d0][y + d1] for d0, d1 in NEIGHBOURS)
+        new.append(ON if rule.table[cells[x][y], surrounding] else OFF)
+    return join_nodes(*new)
+
+
+@functools.lru_cache(maxsize=HASHLIFE_CACHE_SIZE)
+def successor(node, j, rule=CONWAY):
+    """the middle half of a node 2^j generations on, j can be at most node.level - 2
+
+    empty space is taken to stay empty, so the rule can't have births on 0 neighbours
+    """
+    level = node.level
+    if node.population == 0:
+        return empty_node(level - 1)
+    if level == 2:
+        return _life_4x4(node, rule)
+
+    nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+    parts = [  # the nine overlapping sub-nodes, as rows from the top
+        [nw, join_nodes(nw.ne, ne.nw, nw.se, ne.sw), ne],
+        [join_nodes(nw.sw, nw.se, sw.nw, sw.ne), centre_node(node), join_nodes(ne.sw, ne.se, se.nw, se.ne)],
+        [sw, join_nodes(sw.ne, se.nw, sw.se, se.sw), se],
+    ]
+    full_speed = j == level - 2
+    parts = [[successor(part, level - 3 if full_speed else j, rule) for part in row] for row in parts]
+
+    quads = []
+    for row, col in ((0, 0), (0, 1), (1, 0), (1, 1)):
+        quad = join_nodes(parts[row][col], parts[row][col + 1], parts[row + 1][col], parts[row + 1][col + 1])
+        quads.append(successor(quad, level - 3, rule) if full_speed else centre_node(quad))
+    return join_nodes(*quads)
+
+
+_LEVEL_ONE = [join_nodes(*(ON if i >> bit & 1 else OFF for bit in range(4))) for i in range(16)]
+
+
+def array_to_node(cells):
+    """builds a quadtree from a square uint8 array whose side is a power of two"""
+    if cells.shape[0] == 1:
+        return ON if cells[0, 0] else OFF
+    index = cells[0::2, 0::2] | cells[1::2, 0::2] << 1 | cells[0::2, 1::2] << 2 | cells[1::2, 1::2] << 3
+    grid = [[_LEVEL_ONE[i] for i in column] for column in index.tolist()]
+    while len(grid) > 1:
+        grid = [[join_nodes(grid[x][y], grid[x + 1][y], grid[x][y + 1], grid[x + 1][y + 1])
+                 for y in range(0, len(grid), 2)] for x in range(0, len(grid), 2)]
+    return grid[0][0]
+
+
+def node_to_array(node):
+    size = 1 << node.level
+    cells = np.zeros((size, size), np.uint8)
+    stack = [(node, 0, 0)]
+    while stack:
+        node, x, y = stack.pop()
+        if node.population == 0:
+            continue
+        if node.level == 0:
+            cells[x, y] = 1
+            continue
+        half = 1 << (node.level - 1)
+        stack += [(node.nw, x, y), (node.ne, x + half, y), (node.sw, x, y + half), (node.se, x + half, y + half)]
+    return cells
+
+
+HASHLIFE_MIN_JUMP = 1 << 10  # jumps shorter than this, or than a torus is across, are quicker a generation at a time
+PLANE_MIN_LEVEL = 8  # the smallest node an unbounded plane is kept in, so it always moves by whole chunks
+
+
+def can_hashlife(board):
+    """hashlife needs a plane with no edges, so an unbounded plane or a torus whose sides are powers of two
+
+    the rule can't bring empty space to life either
+    """
+    if 0 in board.rule.birth:
+        return False
+    if isinstance(board, ChunkBoard):
+        return True
+    return board.torus and not board.width & (board.width - 1) and not board.height & (board.height - 1)
+
+
+def chunks_to_node(board):
+    """the live chunks of an unbounded plane as one quadtree, and the position of its top left corner
+
+    the tree is built up from the chunks, so the empty space between far apart objects costs nothing
+    """
+    if not board.chunks:
+        return empty_node(PLANE_MIN_LEVEL), 0, 0
+    left, top = min(cx for cx, _ in board.chunks), min(cy for _, cy in board.chunks)
+    nodes = {(cx - left, cy - top): array_to_node(chunk) for (cx, cy), chunk in board.chunks.items()}
+    level = CHUNK.bit_length() - 1
+    while len(nodes) > 1 or level < PLANE_MIN_LEVEL:
+        empty = empty_node(level)
+        parents = {}
+        for (x, y), node in nodes.items():
+            parents.setdefault((x >> 1, y >> 1), [empty] * 4)[(x & 1) + 2 * (y & 1)] = node
+        nodes = {key: join_nodes(*quads) for key, quads in parents.items()}
+        level += 1
+    return nodes[0, 0], left * CHUNK, top * CHUNK
+
+
+def node_to_chunks(node, x, y):
+    """the chunks of a quadtree whose top left corner is at x, y, which have to be whole chunks"""
+    chunks = {}
+    stack = [(node, x, y)]
+    chunk_level = CHUNK.bit_length() - 1
+    while stack:
+        node, x, y = stack.pop()
+        if node.population == 0:
+            continue
+        if node.level == chunk_level:
+            chunks[x // CHUNK, y // CHUNK] = node_to_array(node)
+            continue
+        half = 1 << (node.level - 1)
+        stack += [(node.nw, x, y), (node.ne, x + half, y), (node.sw, x, y + half), (node.se, x + half, y + half)]
+    return chunks
+
+
+def expand_node(node, x, y):
+    """the node in the middle of an empty one twice as big, and where that one's corner is"""
+    empty = empty_node(node.level - 1)
+    half = 1 << (node.level - 1)
+    return (join_nodes(join_nodes(empty, empty, empty, node.nw), join_nodes(empty, empty, node.ne, empty),
+                       join_nodes(empty, node.sw, empty, empty), join_nodes(node.se, empty, empty, empty)), x - half, y - half)
+
+
+def plane_jump(board, generations):
+    """hashlife on an unbounded plane, the live cells are put in enough empty space that nothing can reach its edge"""
+    node, x, y = chunks_to_node(board)
+    k = 0
+    while generations:
+        if generations & 1:
+            # the cells can't spread further than 2^k, so the tree is made at least that big and then padded twice
+            while node.level < k + 1:
+                node, x, y = expand_node(node, x, y)
+            for _ in range(2):
+                node, x, y = expand_node(node, x, y)
+            shift = 1 << (node.level - 2)
+            node, x, y = successor(node, k, board.rule), x + shift, y + shift
+            while node.level > PLANE_MIN_LEVEL and centre_node(node).population == node.population:
+                shift = 1 << (node.level - 2)  # the border is empty, so it is cut off again
+                node, x, y = centre_node(node), x + shift, y + shift
+        generations >>= 1
+        k += 1
+    return ChunkBoard(board.width, board.height, None, node_to_chunks(node, x, y), board.rule)
+
+
+def hashlife_jump(board, generations):
+    """moves a board on by any number of generations, 2^k at a time using hashlife where the board allows it
+
+    short jumps are stepped, building the quadtree for a whole torus costs more than stepping it a few hundred times
+    """
+    short = generations < HASHLIFE_MIN_JUMP or (board.torus and generations < max(board.width, board.height))
+    if short or not can_hashlife(board):
+        for _ in range(generations):
+            board = board.step()
+        return board
+    if isinstance(board, ChunkBoard):
+        return plane_jump(board, generations)
+
+    # a torus is the same as the infinite plane covered in copies of it, so tile it into a square of side 2^level
+    side = max(board.width, board.height, 4)
+    level = side.bit_length() - 1
+    cells = np.tile(board.to_array(), (side // board.width, side // board.height))
+    tile = array_to_node(cells)
+    k = 0
+    while generations:
+        if generations & 1:
+            outer = max(k + 2, level + 1)
+            node = tile
+            for _ in range(outer - level):
+                node = join_nodes(node, node, node, node)
+            result = successor(node, k, board.rule)
+            if outer == level + 1:  # the result starts half a tile in, so swap the quadrants back round
+                tile = join_nodes(result.se, result.sw, result.ne, result.nw)
+            else:
+                while result.level > level:
+                    result = result.nw
+                tile = result
+        generations >>= 1
+        k += 1
+    return type(board).from_array(node_to_array(tile)[:board.width, :board.height], board.topology, board.rule)
+
+
+CYCLE_TABLE_SIZE = 1 << 16  # how many generations of hashes are remembered, periods longer than this go unnoticed
+
+
+def cell_keys(xs, ys):
+    """a random looking 64 bit key for each cell position, the same every run, for zobrist hashing
+
+    the keys are mixed up from the position with splitmix64 rather than kept in a table the size of the board,
+    positions can be negative on an unbounded plane
+    """
+    xs, ys = np.asarray(xs, np.int64).astype(np.uint64), np.asarray(ys, np.int64).astype(np.uint64)
+    z = xs * np.uint64(0xD6E8FEB86659FD93) + ys + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def zobrist(board):
+    """the xor of the keys of every live cell"""
+    xs, ys = board.live_positions()
+    return int(np.bitwise_xor.reduce(cell_keys(xs, ys), initial=np.uint64(0)))
+
+
+class CycleDetector:
+    """spots a board repeating by keeping a zobrist hash of each generation in a bounded table
+
+    each hash is updated from only the cells that flipped, so following a board costs time in how much changes
+    """
+    def __init__(self, board, size=CYCLE_TABLE_SIZE):
+        self.board = board
+        self.size = size
+        self.hash = None  # worked out the first time it is needed, so making a detector is free
+        self.generation = 0
+        self.seen = {}  # hash -> generation, oldest first
+        self.period = None  # set once the board repeats
+        self.start = None  # the generation the cycle starts at
+        self.repeat = None  # the generation the board first repeated at
+
+    @property
+    def found(self):
+        return self.period is not None
+
+    def update(self, board):
+        """follows the board on a generation, returns True on the generation a repeat is first found"""
+        self.generation += 1
+        if self.found:
+            self.board = board
+            return False
+        if self.hash is None:
+            self.hash = zobrist(self.board)
+            self.seen[self.hash] = self.generation - 1
+        xs, ys = board.flipped(self.board)
+        if len(xs):
+            self.hash ^= int(np.bitwise_xor.reduce(cell_keys(xs, ys)))
+        self.board = board
+        if self.hash in self.seen:
+            self.start = self.seen[self.hash]
+            self.period = self.generation - self.start
+            self.repeat = self.generation
+            return True
+        self.seen[self.hash] = self.generation
+        if len(self.seen) > self.size:
+            del self.seen[next(iter(self.seen))]
+        return False
+
+    def kind(self):
+        if not self.found:
+            return None
+        if self.board.population() == 0:
+            return 'died'
+        return 'still life' if self.period == 1 else 'oscillator'
+
+    def report(self):
+        """the cycle as a dict for the json stats"""
+        if not self.found:
+            return None
+        return {'kind': self.kind(), 'period': self.period, 'start': self.start, 'repeat': self.repeat}
+
+    def describe(self):
+        if self.kind() == 'died':
+            return f"died out at generation {self.start}"
+        if self.kind() == 'still life':
+            return f"still life from generation {self.start}"
+        return f"oscillator with period {self.period} from generation {self.start}, first repeated at {self.repeat}"
+
+
+IO_CHUNK = 1 << 24  # how many bytes of a board file are read or written at a time
+
+
+def read_brd(file_name):
+    """reads a .brd file straight into a (width, height) uint8 array, a chunk at a time
+
+    returns the cells and the rule after them, None when the file has no rule
+    """
+    with open(file_name, 'rb') as file:
+        parts = file.read(64).split(b' ', 2)
+        if len(parts) < 3:
+            raise DimensionError("no dimensions in the file")
+        width, height = int(parts[0]), int(parts[1])
+        start = len(parts[0]) + len(parts[1]) + 2
+        if width < 0 or height < 0 or os.fstat(file.fileno()).st_size < start + width * height:
+            raise DimensionError("dimensions do not fit data")  # checked before making an array as big as the header says
+        file.seek(start)
+        cells = np.empty(width * height, np.uint8)
+        view = memoryview(cells)
+        read = 0
+        while read < cells.size:
+            n = file.readinto(view[read:read + IO_CHUNK])
+            if not n:
+                break
+            read += n
+        if read != cells.size:
+            raise DimensionError("dimensions do not fit data")
+        rest = file.read(64).strip()
+    rule = None
+    if rest:
+        try:
+            rule = Rule.parse(rest.decode('ascii'))
+        except (UnicodeDecodeError, ValueError):
+            raise DimensionError("dimensions do not fit data")
+    cells -= ord('0')
+    if (cells > 1).any():
+        raise ValueError("cells can only be 0 or 1")
+    return cells.reshape(width, height), rule
+
+
+def write_brd(file_name, board):
+    """writes a board as a .brd file, a chunk of columns at a time, with the rule on the end unless it's conway's"""
+    cells = board.to_array()
+    step = max(1, IO_CHUNK // board.height)
+    with open(file_name, 'wb') as file:
+        file.write(f"{board.width} {board.height} ".encode())
+        for x in range(0, board.width, step):
+            file.write((cells[x:x + step] + ord('0')).tobytes())
+        if not board.rule.conway:
+            file.write(f" {board.rule}".encode())
+
+
+PATTERN_EXTENSIONS = ('.brd', '.rle', '.pbrd')
+PBRD_MAGIC = b'GOLB'
+PBRD_HEADER = struct.Struct('<4sBxxxII')  # magic, version, width, height, then the packed columns
+PBRD_RULE = struct.Struct('<HH')  # version 2 files have the rule after the header, as bit masks of birth and survive counts
+RLE_LINE = 70  # rle lines are kept this short
+RLE_MAX_CELLS = 1 << 28  # an rle header asking for a bigger board than this is taken to be broken
+
+
+def read_pbrd(file_name):
+    """maps a packed board file into memory, returning the packed columns without copying them, the height and rule"""
+    with open(file_name, 'rb') as file:
+        head = file.read(PBRD_HEADER.size + PBRD_RULE.size)
+    if len(head) < PBRD_HEADER.size:
+        raise DimensionError("no dimensions in the file")
+    magic, version, width, height = PBRD_HEADER.unpack(head[:PBRD_HEADER.size])
+    if magic != PBRD_MAGIC or version not in (1, 2):
+        raise ValueError("not a packed board file")
+    offset, rule = PBRD_HEADER.size, None
+    if version == 2:
+        if len(head) < offset + PBRD_RULE.size:
+            raise DimensionError("dimensions do not fit data")
+        birth, survive = PBRD_RULE.unpack(head[offset:])
+        rule = Rule((n for n in range(9) if birth >> n & 1), (n for n in range(9) if survive >> n & 1))
+        offset += PBRD_RULE.size
+    size = (height + 7) // 8
+    if os.path.getsize(file_name) != offset + width * size:
+        raise DimensionError("dimensions do not fit data")
+    return np.memmap(file_name, np.uint8, 'r', offset, (width, size)), height, rule
+
+
+def write_pbrd(file_name, board):
+    """conway boards are written as version 1, anything else as version 2 with its rule"""
+    rule = board.rule
+    with open(file_name, 'wb') as file:
+        file.write(PBRD_HEADER.pack(PBRD_MAGIC, 1 if rule.conway else 2, board.width, board.height))
+        if not rule.conway:
+            file.write(PBRD_RULE.pack(sum(1 << n for n in rule.birth), sum(1 << n for n in rule.survive)))
+        file.write(board.to_packed().tobytes())
+
+
+def read_rle(file_name):
+    """reads a standard run length encoded pattern into a (width, height) uint8 array and its rule, if it has one"""
+    with open(file_name, 'r') as file:
+        lines = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    header = re.match(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', lines[0]) if lines else None
+    if header is None:
+        raise DimensionError("no dimensions in the file")
+    width, height = int(header[1]), int(header[2])
+    if width * height > RLE_MAX_CELLS:
+        raise DimensionError(f"{width}x{height} is too big for a board")
+    rule = None if header[3] is None else Rule.parse(header[3])
+    cells = np.zeros((width, height), np.uint8)
+    x = y = 0
+    for count, tag in re.findall(r'(\d*)([^\d\s])', ''.join(lines[1:])):
+        count = int(count) if count else 1
+        if tag == '!':
+            break
+        elif tag == '$':
+            x, y = 0, y + count
+        elif tag in 'b.':
+            x += count
+        else:
+            if x + count > width or y >= height:
+                raise DimensionError("dimensions do not fit data")
+            cells[x:x + count, y] = 1
+            x += count
+    return cells, rule
+
+
+def write_rle(file_name, board, name=None):
+    """the name goes in the #N line, it's the file's name if not given"""
+    if name is None:
+        name = os.path.splitext(os.path.basename(file_name))[0]
+    cells = board.to_array()
+    tokens = []
+    last_y = 0
+    for y in np.flatnonzero(cells.any(axis=0)).tolist():
+        if y > last_y:
+            tokens.append(f"{y - last_y if y - last_y > 1 else ''}$")
+        edges = np.flatnonzero(np.diff(cells[:, y], prepend=0, append=0)).tolist()
+        x = 0
+        for start, end in zip(edges[::2], edges[1::2]):
+            if start > x:
+                tokens.append(f"{start - x if start - x > 1 else ''}b")
+            tokens.append(f"{end - start if end - start > 1 else ''}o")
+            x = end
+        last_y = y
+    tokens.append('!')
+
+    lines = ['']
+    for token in tokens:
+        if len(lines[-1]) + len(token) > RLE_LINE:
+            lines.append('')
+        lines[-1] += token
+    with open(file_name, 'w') as file:
+        file.write(f"#N {name}\n")
+        file.write(f"x = {board.width}, y = {board.height}, rule = {board.rule}\n")
+        file.write('\n'.join(lines) + '\n')
+
+
+def read_pattern(file_name, board_type, topology=None, rule=None):
+    """reads a pattern file in any of the formats into a board of the given type
+
+    the board gets the rule saved in the file unless another is given, and conway's if the file has none
+    """
+    if topology is PlaneList:
+        board_type = ChunkBoard
+    file_format = pattern_format(file_name)
+    if file_format == 'pbrd':
+        packed, height, file_rule = read_pbrd(file_name)
+        board = board_type.from_packed(packed, height, topology, rule or file_rule)
+    elif file_format == 'rle':
+        cells, file_rule = read_rle(file_name)
+        board = board_type.from_array(cells, topology, rule or file_rule)
+    elif file_format == 'brd':
+        cells, file_rule = read_brd(file_name)
+        board = board_type.from_array(cells, topology, rule or file_rule)
+    else:
+        raise TypeError("not a pattern file")
+    if not board.width or not board.height:
+        raise DimensionError("the board is empty")
+    return board
+
+
+@contextlib.contextmanager
+def replacing(file_name):
+    """gives a temporary file name next to file_name to write to, which then replaces file_name
+
+    so the file is never left half written, it's either the old one or the new one
+    """
+    temp_name = file_name + '.part'
+    try:
+        yield temp_name
+        os.replace(temp_name, file_name)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_name)
+        raise
+
+
+def write_pattern(file_name, board):
+    """writes a board in the format that goes with the file's extension, all of the live cells on an unbounded plane"""
+    if isinstance(board, ChunkBoard):
+        board = board.bounded()
+    name, extension = os.path.splitext(file_name)
+    with replacing(file_name) as temp_name:
+        if extension == '.rle':
+            write_rle(temp_name, board, os.path.basename(name))
+        else:
+            {'.pbrd': write_pbrd}.get(extension, write_brd)(temp_name, board)
+
+
+THUMBNAIL_SIZE = 64  # the longest side of a pattern's thumbnail
+
+
+def thumbnail(cells, size=THUMBNAIL_SIZE):
+    """the cells shrunk by a whole factor until the longest side fits in size, as how full each block is from 0 to 255
+
+    a block with any live cells is at least a little lit, so lone cells on big boards still show up
+    """
+    factor = max(1, -(-max(cells.shape) // size))
+    cells = np.pad(cells, ((0, -cells.shape[0] % factor), (0, -cells.shape[1] % factor)))
+    counts = cells.reshape(cells.shape[0] // factor, factor, cells.shape[1] // factor, factor).sum(axis=(1, 3), dtype=np.uint32)
+    return np.where(counts > 0, 64 + counts * 191 // (factor * factor), 0).astype(np.uint8)
+
+
+def pattern_summary(file_name):
+    """what the pattern browser shows about a file, its size, population, rule, a hash of its cells and a thumbnail"""
+    board = read_pattern(file_name, ArrayBoard)
+    cells = board.to_array()
+    return {'width': board.width, 'height': board.height, 'population': board.population(), 'rule': str(board.rule),
+            'hash': f'{zobrist(board):016x}', 'thumbnail': thumbnail(cells)}
+
+
+def pattern_format(file_name):
+    """works out a pattern file's format from its magic bytes, its extension, or failing that how it starts"""
+    with open(file_name, 'rb') as file:
+        head = file.read(PBRD_HEADER.size).lstrip()
+    extension = os.path.splitext(file_name)[1]
+    if head.startswith(PBRD_MAGIC):
+        return 'pbrd'
+    elif extension in PATTERN_EXTENSIONS:
+        return extension[1:]
+    elif head[:1] in (b'#', b'x'):
+        return 'rle'
+    elif head[:1].isdigit():
+        return 'brd'
+    return None
+
+
+def convert(file_name, file_format):
+    """writes a copy of a pattern file in another format next to it, returning the new file's name"""
+    new_name = os.path.splitext(file_name)[0] + '.' + file_format
+    write_pattern(new_name, read_pattern(file_name, ArrayBoard))
+    logging.info(f"converted {file_name} to {new_name}")
+    return new_name
+
+
+RECORD_EVERY = 1  # generations between frames
+RECORD_FPS = 25  # how fast an animated png plays back
+RECORD_QUEUE = 64  # frames that can be waiting for the writer before whatever is stepping the board has to wait for it
+RECORD_EXTENSIONS = ('.png', '.apng', '.raw')
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def write_apng(file, frames, width, height, fps=RECORD_FPS):
+    """writes frames to an animated png as they come, one bit a cell with live cells white
+
+    each frame is the rows of the board packed 8 cells a byte, the number of frames is filled in at the end so the file
+    has to be seekable, returns how many frames were written
+    """
+    file.write(PNG_SIGNATURE + png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 0, 0, 0, 0)))
+    animation = file.tell()
+    file.write(png_chunk(b'acTL', struct.pack('>II', 0, 0)))
+    sequence = count = 0
+    for frame in frames:
+        data = zlib.compress(np.pad(frame, ((0, 0), (1, 0))).tobytes())  # a 0 before each row, for no filter
+        file.write(png_chunk(b'fcTL', struct.pack('>IIIIIHHBB', sequence, width, height, 0, 0, 1, fps, 0, 0)))
+        if count == 0:
+            file.write(png_chunk(b'IDAT', data))  # the first frame is also the still image
+            sequence += 1
+        else:
+            file.write(png_chunk(b'fdAT', struct.pack('>I', sequence + 1) + data))
+            sequence += 2
+        count += 1
+    file.write(png_chunk(b'IEND', b''))
+    file.seek(animation)
+    file.write(png_chunk(b'acTL', struct.pack('>II', count, 0)))
+    return count
+
+
+def write_raw(file, frames, width):
+    """writes frames as raw 8 bit grey pixels with no header, for piping into an encoder, returns how many were written"""
+    count = 0
+    for frame in frames:
+        file.write((np.unpackbits(frame, axis=1, count=width) * 255).tobytes())
+        count += 1
+    return count
+
+
+class Recorder(threading.Thread):
+    """streams every so many generations of a board into a recording, written on its own thread
+
+    frames are cut straight out of the board and packed to a bit a cell, then handed over through a queue of at most
+    queue_size frames, so nothing that steps the board waits on the disk unless the writer is a whole queue behind, and
+    then it waits rather than losing frames
+    the first board added sets the frame size, later boards are cropped or padded to it
+    a file name ending in .raw, or - for stdout, gets raw grey frames, anything else an animated png
+    """
+    def __init__(self, file_name, every=RECORD_EVERY, fps=RECORD_FPS, queue_size=RECORD_QUEUE):
+        super().__init__(daemon=True)
+        self.file_name = file_name
+        self.every = every
+        self.fps = fps
+        self.queue = queue.Queue(queue_size)
+        self.lock = threading.Lock()  # so a frame can't be added after close
+        self.size = None
+        self.generation = 0  # generations offered since recording started
+        self.frames = 0  # frames written
+        self.finished = False  # if the writer has had everything
+        self.closed = False
+        self.error = None
+
+    def offer(self, board, generations=1):
+        """called after the board moves on by some generations, adds a frame if one is due"""
+        self.generation += generations
+        if self.generation // self.every != (self.generation - generations) // self.every:
+            self.add(board)
+
+    def add(self, board):
+        with self.lock:
+            if self.closed or self.error is not None:
+                return
+            if self.size is None:
+                self.size = board.width, board.height
+            self.queue.put(np.packbits(board.region(0, 0, *self.size).T, axis=1))
+
+    def take(self):
+        """the frames from the queue until close"""
+        while True:
+            frame = self.queue.get()
+            if frame is None:
+                break
+            yield frame
+        self.finished = True
+
+    def run(self):
+        try:
+            if self.file_name == '-':
+                self.write(sys.stdout.buffer)
+            else:
+                with replacing(self.file_name) as temp_name, open(temp_name, 'wb') as file:
+                    self.write(file)
+        except Exception as error:  # handed to close, as the thread stepping the board can't see it here
+            logging.warning(f"could not record to {self.file_name}")
+            self.error = error
+            while not self.finished and self.queue.get() is not None:
+                pass  # drops whatever is left, so nothing waits on a full queue
+
+    def write(self, file):
+        frames = self.take()
+        first = next(frames, None)
+        if first is None:
+            return
+        frames = itertools.chain([first], frames)
+        width, height = self.size
+        if self.file_name == '-' or self.file_name.endswith('.raw'):
+            logging.info(f"recording {width}x{height} grey frames, play them with "
+                         f"ffmpeg -f rawvideo -pix_fmt gray -s {width}x{height} -framerate {self.fps} -i <file>")
+            self.frames = write_raw(file, frames, width)
+        else:
+            self.frames = write_apng(file, frames, width, height, self.fps)
+
+    def close(self):
+        """waits for the frames already added to be written and finishes the file, returning how many frames it has"""
+        with self.lock:
+            if not self.closed:
+                self.closed = True
+                self.queue.put(None)
+        if self.is_alive():
+            self.join()
+        if self.error is not None:
+            raise self.error
+        return self.frames
+
+
+def run_pattern(file_name, generations, out=None, engine='array', topology='torus', use_hashlife=False, sample=0,
+                cycles=False, stop_on_cycle=False, rule=None, record=None, record_every=RECORD_EVERY, record_fps=RECORD_FPS):
+    """runs a pattern file for some generations as fast as it can, saving the result to out if given
+
+    with cycles the board is watched for repeats, and stop_on_cycle ends the run at the first one, hashlife is left off
+    for these as it skips the generations the board is watched on
+    a rulestring in rule is used in place of the rule in the file
+    with record every record_every generations are streamed to that file, see Recorder, hashlife is left off so none
+    are skipped
+    returns stats about the run
+    """
+    board = read_pattern(file_name, ENGINES[engine], TOPOLOGIES[topology], None if rule is None else Rule.parse(rule))
+    stats = {'pattern': file_name, 'width': board.width, 'height': board.height, 'rule': str(board.rule),
+             'generations': generations, 'start_population': board.population()}
+    if sample:
+        stats['populations'] = [stats['start_population']]
+    detector = CycleDetector(board) if cycles or stop_on_cycle else None
+    recorder = None
+    if record is not None:
+        recorder = Recorder(record, record_every, record_fps)
+        recorder.start()
+        recorder.add(board)
+    start = time.perf_counter()
+    if use_hashlife and can_hashlife(board) and recorder is None and detector is None:
+        board = hashlife_jump(board, generations)
+    else:
+        for generation in range(1, generations + 1):
+            board = board.step()
+            if recorder is not None:
+                recorder.offer(board)
+            if sample and generation % sample == 0:
+                stats['populations'].append(board.population())
+            if detector is not None and detector.update(board) and stop_on_cycle:
+                generations = stats['generations'] = generation
+                break
+    seconds = time.perf_counter() - start
+    if recorder is not None:
+        stats['record'] = record
+        stats['frames'] = recorder.close()
+        stats['recording_seconds'] = time.perf_counter() - start - seconds  # waiting for the writer to catch up at the end
+    if detector is not None:
+        stats['cycle'] = detector.report()
+    stats['population'] = board.population()
+    if isinstance(board, ChunkBoard):
+        stats['chunks'] = len(board.chunks)
+    stats['seconds'] = seconds
+    stats['generations_per_second'] = generations / seconds if seconds else None
+    stats['cells_per_second'] = generations * board.width * board.height / seconds if seconds else None
+    if out is not None:
+        write_pattern(out, board)
+        stats['out'] = out
+    return stats
+
+
+CENSUS_SIZE = (16, 16)  # soups are this big, on an unbounded plane so anything that flies off is free to go
+CENSUS_DENSITY = 0.5
+CENSUS_GENERATIONS = 10000  # soups that haven't settled by now are counted as unsettled
+CENSUS_MAX_PERIOD = 30  # the longest period looked for, both in a whole soup and in each object
+CENSUS_CHECK = 30  # generations between checks for a soup having settled
+CENSUS_WINDOW = 120  # how many generations the population has to keep repeating for to count as settled
+CENSUS_BATCH = 20  # soups a worker runs before handing back its counts
+CENSUS_TABLE = 'census.json'
+WECHSLER = '0123456789abcdefghijklmnopqrstuvwxyz'
+OBJECT_NAMES = {  # what some of the codes are called, under conway's rule
+    'xs4_33': 'block', 'xs6_696': 'beehive', 'xs7_2596': 'loaf', 'xs5_253': 'boat', 'xs6_356': 'ship',
+    'xs4_252': 'tub', 'xs8_6996': 'pond', 'xs6_25a4': 'barge', 'xs7_25ac': 'long boat', 'xp2_7': 'blinker',
+    'xp2_7e': 'toad', 'xp2_318c': 'beacon', 'xq4_153': 'glider', 'xq4_6frc': 'lightweight spaceship',
+}
+
+
+def soup_cells(index, seed=0, size=CENSUS_SIZE, density=CENSUS_DENSITY):
+    """soup number index of a census, the same every time for the same seed"""
+    return (np.random.default_rng([seed, index]).random(size) < density).astype(np.uint8)
+
+
+def settled_period(populations):
+    """the shortest period the population has been repeating with for the last CENSUS_WINDOW generations, or None"""
+    if len(populations) < CENSUS_WINDOW + CENSUS_MAX_PERIOD:
+        return None
+    recent = np.array(populations[-(CENSUS_WINDOW + CENSUS_MAX_PERIOD):])
+    for period in range(1, CENSUS_MAX_PERIOD + 1):
+        if (recent[-CENSUS_WINDOW:] == recent[-CENSUS_WINDOW - period:-period]).all():
+            return period
+    return None
+
+
+def clusters(xs, ys, reach=2):
+    """splits cells into groups where each cell is within reach of another in its group, as lists of (x, y)
+
+    cells further than 2 apart share no neighbours, so groups that far apart can't affect each other
+    """
+    left = set(zip(xs.tolist(), ys.tolist()))
+    offsets = [(dx, dy) for dx in range(-reach, reach + 1) for dy in range(-reach, reach + 1) if dx or dy]
+    groups = []
+    while left:
+        group = [left.pop()]
+        stack = group[:]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in offsets:
+                if (x + dx, y + dy) in left:
+                    left.remove((x + dx, y + dy))
+                    group.append((x + dx, y + dy))
+                    stack.append((x + dx, y + dy))
+        groups.append(group)
+    return groups
+
+
+def trimmed(cells):
+    """the cells cut down to the box around the live ones, and where that box starts"""
+    xs, ys = np.flatnonzero(cells.any(axis=1)), np.flatnonzero(cells.any(axis=0))
+    if not len(xs):
+        return cells[:0, :0], (0, 0)
+    return cells[xs[0]:xs[-1] + 1, ys[0]:ys[-1] + 1], (int(xs[0]), int(ys[0]))
+
+
+def wechsler(cells):
+    """trimmed cells in extended wechsler format, each column of a five row strip as one base 32 digit
+
+    strips are split by z, and runs of 0s are shortened to w, x or y and a count
+    """
+    strips = []
+    for y in range(0, cells.shape[1], 5):
+        strip = cells[:, y:y + 5].astype(np.int64)
+        digits = strip @ (1 << np.arange(strip.shape[1]))
+        strips.append(''.join(WECHSLER[digit] for digit in digits.tolist()).rstrip('0'))
+    runs = {2: 'w', 3: 'x'}
+    return re.sub('0{2,39}', lambda zeros: runs.get(len(zeros[0])) or 'y' + WECHSLER[len(zeros[0]) - 4], 'z'.join(strips))
+
+
+def canonical(cells):
+    """the shortest, then first in order, code of the cells over their eight rotations and reflections"""
+    return min((wechsler(trimmed(np.rot90(flipped, turns))[0]) for flipped in (cells, cells[::-1]) for turns in range(4)),
+               key=lambda code: (len(code), code))
+
+
+def classify(cells, rule=CONWAY):
+    """works out what an object is by running it on its own, returning an apgsearch style code
+
+    still lifes are xs<population>_, oscillators xp<period>_ and spaceships xq<period>_, followed by the smallest
+    code over every phase, rotation and reflection
+    anything that doesn't come back within CENSUS_MAX_PERIOD, or needed something else nearby, is xx<population>_
+    """
+    start, origin = trimmed(cells)
+    phases = [start]
+    current, position = start, origin
+    for generation in range(1, CENSUS_MAX_PERIOD + 1):
+        current, offset = trimmed(next_generation(np.pad(current, 1), False, rule))
+        position = (position[0] + offset[0] - 1, position[1] + offset[1] - 1)
+        if current.shape == start.shape and (current == start).all():
+            if position != origin:
+                prefix = f'xq{generation}'
+            elif generation == 1:
+                prefix = f'xs{int(start.sum())}'
+            else:
+                prefix = f'xp{generation}'
+            return prefix + '_' + min((canonical(phase) for phase in phases), key=lambda code: (len(code), code))
+        if not current.size:
+            break
+        phases.append(current)
+    return f'xx{int(start.sum())}_{canonical(start)}'
+
+
+def separate(cells, rule=CONWAY, period=1):
+    """splits a group of cells into its touching pieces if each piece goes on the same way without the others
+
+    things like traffic lights and blocks side by side are counted as what they're made of, like apgsearch does
+    returns a list of cell arrays, just the group if it can't be split
+    """
+    padded = np.pad(cells, period + 1)
+    phases = [padded]
+    for _ in range(period):
+        phases.append(next_generation(phases[-1], False, rule))
+    pieces = clusters(*np.nonzero(np.logical_or.reduce(phases)), reach=1)
+    if len(pieces) == 1:
+        return [cells]
+    parts = []
+    for piece in pieces:
+        mask = np.zeros(padded.shape, bool)
+        mask[tuple(np.array(piece).T)] = True
+        parts.append(padded * mask)
+    current = parts
+    for phase in phases[1:]:
+        current = [next_generation(part, False, rule) for part in current]
+        if not (sum(current) == phase).all():
+            return [cells]
+    return [trimmed(part)[0] for part in parts if part.any()]
+
+
+def run_soup(index, seed=0, size=CENSUS_SIZE, density=CENSUS_DENSITY, rule=CONWAY, generations=CENSUS_GENERATIONS):
+    """runs one soup on an unbounded plane until its population settles into a cycle
+
+    returns a Counter of the objects left, or None if it didn't settle, and how many generations it ran
+    """
+    board = ChunkBoard.from_array(soup_cells(index, seed, size, density), rule=rule)
+    populations = [board.population()]
+    period = None
+    for generation in range(1, generations + 1):
+        board = board.step()
+        populations.append(board.population())
+        if not populations[-1]:
+            return collections.Counter(), generation
+        if generation % CENSUS_CHECK == 0:
+            period = settled_period(populations)
+            if period is not None:
+                break
+    if period is None:
+        return None, generations
+
+    # the cells of every phase are grouped together, so objects that only come close in some phases stay as one
+    xs, ys = board.live_positions()
+    phase_xs, phase_ys = [xs], [ys]
+    phase = board
+    for _ in range(period - 1):
+        phase = phase.step()
+        phase_xs.append(phase.live_positions()[0])
+        phase_ys.append(phase.live_positions()[1])
+    live = set(zip(xs.tolist(), ys.tolist()))
+    objects = collections.Counter()
+    for group in clusters(np.concatenate(phase_xs), np.concatenate(phase_ys)):
+        cells = np.array([cell for cell in group if cell in live]).reshape(-1, 2)
+        if not len(cells):
+            continue
+        cells -= cells.min(axis=0)
+        array = np.zeros(cells.max(axis=0) + 1, np.uint8)
+        array[cells[:, 0], cells[:, 1]] = 1
+        for part in separate(array, rule, period):
+            objects[classify(part, rule)] += 1
+    return objects, generation
+
+
+def census_batch(start, count, seed, size, density, rule, generations):
+    """runs soups start to start + count in a worker, returning the objects, how many didn't settle and generations run"""
+    objects, unsettled, total = collections.Counter(), 0, 0
+    for index in range(start, start + count):
+        found, ran = run_soup(index, seed, size, density, rule, generations)
+        total += ran
+        if found is None:
+            unsettled += 1
+        else:
+            objects.update(found)
+    return objects, unsettled, total
+
+
+def census(soups, table_file=CENSUS_TABLE, seed=0, size=CENSUS_SIZE, density=CENSUS_DENSITY, rule=CONWAY,
+           generations=CENSUS_GENERATIONS, jobs=None, log=sys.stderr):
+    """runs more soups across a process pool, adding what they leave to the table in table_file
+
+    the table keeps how many soups have been run, so running again with the same settings carries on from the
+    next soup, batches are only added once every batch before them is, so a stopped census never counts a soup twice
+    returns the stats of this run
+    """
+    settings = {'seed': seed, 'width': size[0], 'height': size[1], 'density': density, 'rule': str(rule),
+                'max_generations': generations}
+    table = {**settings, 'soups': 0, 'unsettled': 0, 'generations': 0, 'seconds': 0.0, 'objects': {}}
+    if table_file is not None and os.path.exists(table_file):
+        with open(table_file) as file:
+            table = json.load(file)
+        different = [key for key, value in settings.items() if table.get(key) != value]
+        if different:
+            raise ValueError(f"{table_file} is a census with a different {', '.join(different)}")
+    jobs = jobs or os.cpu_count()
+    first, end = table['soups'], table['soups'] + soups
+    finished = {}  # batches that are done but have one before them that isn't
+    start = counted = time.perf_counter()
+
+    def save():
+        table['objects'] = dict(sorted(table['objects'].items(), key=lambda item: (-item[1], item[0])))
+        if table_file is not None:
+            with replacing(table_file) as temp_name, open(temp_name, 'w') as file:
+                json.dump(table, file, indent=2)
+
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(census_batch, batch, min(CENSUS_BATCH, end - batch), seed, size, density, rule, generations): batch
+                   for batch in range(first, end, CENSUS_BATCH)}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                finished[futures[future]] = future.result()
+                before = table['soups']
+                while table['soups'] in finished:
+                    objects, unsettled, total = finished.pop(table['soups'])
+                    for code, count in objects.items():
+                        table['objects'][code] = table['objects'].get(code, 0) + count
+                    table['unsettled'] += unsettled
+                    table['generations'] += total
+                    table['soups'] = min(table['soups'] + CENSUS_BATCH, end)
+                if table['soups'] != before:
+                    table['seconds'] += time.perf_counter() - counted
+                    counted = time.perf_counter()
+                    save()
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            logging.info(f"stopped, the table has the first {table['soups']} soups")
+    seconds = time.perf_counter() - start
+    ran = table['soups'] - first
+    cores = min(jobs, os.cpu_count() or jobs)
+    stats = {'table': table_file, 'soups': ran, 'total_soups': table['soups'], 'jobs': jobs, 'seconds': seconds,
+             'soups_per_second': ran / seconds if seconds else None,
+             'soups_per_second_per_core': ran / seconds / cores if seconds else None}
+    for code, count in list(table['objects'].items())[:10]:
+        name = OBJECT_NAMES.get(code) if rule.conway else None
+        print(f"{count:>10} {code}" + ("" if name is None else f" ({name})"), file=log)
+    return stats
+
+
+def cli(args=None):
+    """the headless command line, run or convert patterns or take a census of random soups without a display"""
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]), description="the game of life without a display")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run patterns for a number of generations")
+    run.add_argument('pattern', help="a pattern file, or a directory of them to run at the same time")
+    run.add_argument('--generations', type=int, default=100)
+    run.add_argument('--out', help="where the final board goes, a directory when running a directory")
+    run.add_argument('--engine', choices=ENGINES, default='array')
+    run.add_argument('--topology', choices=TOPOLOGIES, default='torus')
+    run.add_argument('--rule', help=f"a rulestring like B36/S23 or one of {', '.join(RULES)}, in place of the file's rule")
+    run.add_argument('--hashlife', action='store_true', help="jump with hashlife when the board allows it")
+    run.add_argument('--sample', type=int, default=0, help="record the population every this many generations")
+    run.add_argument('--jobs', type=int, default=os.cpu_count(), help="how many patterns run at once")
+    run.add_argument('--workers', type=int, default=1, help="how many threads step each array board")
+    run.add_argument('--stats', help="also write the stats of every run to this json file")
+    run.add_argument('--cycles', action='store_true', help="watch for the board repeating and report the period")
+    run.add_argument('--stop-on-cycle', action='store_true', help="stop a run as soon as its board repeats")
+    run.add_argument('--record', help="stream the run to an animated .png, or raw grey frames in a .raw file or - for stdout")
+    run.add_argument('--record-every', type=int, default=RECORD_EVERY, help="generations between recorded frames")
+    run.add_argument('--record-fps', type=int, default=RECORD_FPS, help="how fast the animated png plays")
+
+    convert_parser = commands.add_parser('convert', help="write copies of pattern files in another format")
+    convert_parser.add_argument('patterns', nargs='+')
+    convert_parser.add_argument('--to', choices=[extension[1:] for extension in PATTERN_EXTENSIONS], default='rle')
+
+    census_parser = commands.add_parser('census', help="run random soups until they settle and count what they leave")
+    census_parser.add_argument('--soups', type=int, default=1000, help="how many more soups to run")
+    census_parser.add_argument('--size', type=lambda text: tuple(int(side) for side in text.lower().split('x')),
+                               default=CENSUS_SIZE, help="soup size, like 16x16")
+    census_parser.add_argument('--density', type=float, default=CENSUS_DENSITY)
+    census_parser.add_argument('--seed', type=int, default=0)
+    census_parser.add_argument('--generations', type=int, default=CENSUS_GENERATIONS, help="give up on soups after this")
+    census_parser.add_argument('--rule', default=str(CONWAY), help=f"a rulestring like B36/S23 or one of {', '.join(RULES)}")
+    census_parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="how many soups run at once")
+    census_parser.add_argument('--table', default=CENSUS_TABLE, help="the table to add to, carrying on from where it got to")
+
+    args = parser.parse_args(args)
+    if args.command in ('run', 'census') and args.rule is not None:
+        try:
+            rule = Rule.parse(args.rule)
+        except ValueError as error:
+            parser.error(str(error))
+        if args.command == 'census' and 0 in rule.birth:
+            parser.error("a rule with births on 0 neighbours would fill the whole plane")
+    if args.command == 'run' and args.record is not None:
+        if os.path.isdir(args.pattern):
+            parser.error("--record only works when running a single pattern")
+        if args.record_every < 1 or not 0 < args.record_fps < 1 << 16:
+            parser.error("--record-every and --record-fps have to be positive, and --record-fps below 65536")
+    if args.command == 'convert':
+        for file_name in args.patterns:
+            convert(file_name, args.to)
+        return 0
+    if args.command == 'census':
+        try:
+            stats = census(args.soups, args.table, args.seed, args.size, args.density, rule, args.generations, args.jobs)
+        except ValueError as error:
+            parser.error(str(error))
+        print(json.dumps(stats))
+        return 0
+
+    options = dict(generations=args.generations, engine=args.engine, topology=args.topology,
+                   use_hashlife=args.hashlife, sample=args.sample, cycles=args.cycles, stop_on_cycle=args.stop_on_cycle,
+                   rule=args.rule, record=args.record, record_every=args.record_every, record_fps=args.record_fps)
+    if os.path.isdir(args.pattern):
+        files = sorted(os.path.join(args.pattern, name) for name in os.listdir(args.pattern)
+                       if os.path.splitext(name)[1] in PATTERN_EXTENSIONS)
+        if args.out is not None:
+            os.makedirs(args.out, exist_ok=True)
+        outs = [None if args.out is None else os.path.join(args.out, os.path.basename(name)) for name in files]
+        all_stats = []
+        with concurrent.futures.ProcessPoolExecutor(args.jobs, initializer=set_workers, initargs=(args.workers,)) as pool:
+            futures = [pool.submit(run_pattern, name, out=out, **options) for name, out in zip(files, outs)]
+            for future in concurrent.futures.as_completed(futures):
+                all_stats.append(future.result())
+                print(json.dumps(all_stats[-1]), flush=True)
+    else:
+        set_workers(args.workers)
+        all_stats = [run_pattern(args.pattern, out=args.out, **options)]
+        print(json.dumps(all_stats[0]), file=sys.stderr if args.record == '-' else sys.stdout)  # stdout has the frames
+
+    if args.stats is not None:
+        with open(args.stats, 'w') as file:
+            json.dump(all_stats, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] -> %(message)s")
+    sys.exit(cli())